@@ -12,6 +12,7 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
@@ -57,6 +58,21 @@ def get_table_path(artifacts_root: Path, table_name: str) -> Path:
     return None
 
 
+def _read_partition_file(pf: Path) -> pd.DataFrame:
+    """Read one partition file and restore its hive partition columns."""
+    partition_df = pd.read_parquet(pf)
+
+    # Restore partition columns from directory structure
+    # Example: fiscal_year=2008/data.parquet → add fiscal_year=2008 column
+    for part in pf.parts:
+        if '=' in part:
+            col_name, col_value = part.split('=', 1)
+            if col_name not in partition_df.columns:
+                partition_df[col_name] = col_value
+
+    return partition_df
+
+
 def audit_table(
     table_name: str,
     table_schema: dict,
@@ -106,21 +122,10 @@ def audit_table(
                 result["error"] = "No parquet files found in directory"
                 return result
             
-            # Read each partition file individually
-            dfs = []
-            for pf in parquet_files:
-                partition_df = pd.read_parquet(pf)
-                
-                # Restore partition columns from directory structure
-                # Example: fiscal_year=2008/data.parquet → add fiscal_year=2008 column
-                parts = pf.parts
-                for part in parts:
-                    if '=' in part:
-                        col_name, col_value = part.split('=', 1)
-                        if col_name not in partition_df.columns:
-                            partition_df[col_name] = col_value
-                
-                dfs.append(partition_df)
+            # Read each partition file individually; reads are I/O-bound, so
+            # fan them out over CONCURRENCY threads (map keeps file order).
+            with ThreadPoolExecutor(max_workers=max(1, CONCURRENCY)) as pool:
+                dfs = list(pool.map(_read_partition_file, parquet_files))
             
             df = pd.concat(dfs, ignore_index=True)
         
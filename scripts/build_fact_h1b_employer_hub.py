@@ -79,7 +79,7 @@ COL_MAP = {
 
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Normalize column names using the alias map."""
+    """Normalize column names using the alias map (renames df in place and returns it)."""
     rename = {}
     for col in df.columns:
         key = col.strip().lower().replace("_", " ")
@@ -90,7 +90,9 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
             key2 = re.sub(r"\s+", " ", key)
             if key2 in COL_MAP:
                 rename[col] = COL_MAP[key2]
-    df = df.rename(columns=rename)
+    # Callers pass a freshly read frame, so rename in place rather than
+    # allocating a second DataFrame per file
+    df.rename(columns=rename, inplace=True)
     return df
 
 
@@ -19,6 +19,7 @@ Log:    artifacts/metrics/fact_perm_unique_case.log
 
 Global controls:
   CHUNK_SIZE         = 250_000 (env CHUNK_SIZE)
+  READ_WORKERS       = min(16, cpu_count) (env READ_WORKERS) — parallel partition reads
   ONLY_REWRITE_PARQUET = True  (read existing parquet only)
   exclude: _backup/, _quarantine/, *.tmp_*
   atomic_write: write to .tmp_<name>, then rename
@@ -29,25 +30,32 @@ from __future__ import annotations
 
 import argparse
 import os
+import re
 import sys
 import shutil
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import psutil  # graceful fallback if not installed
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 # ── Global performance knobs ──────────────────────────────────────────────────
 _DEFAULT_CHUNK_SIZE = 250_000
 _HIGH_RAM_THRESHOLD_GB = 48
+_MAX_READ_WORKERS = int(os.environ.get("READ_WORKERS", min(16, os.cpu_count() or 1)))
 
 
 def _get_chunk_size() -> int:
     base = int(os.environ.get("CHUNK_SIZE", _DEFAULT_CHUNK_SIZE))
     try:
-        ram_gb = psutil.virtual_memory().total / (1024 ** 3)
+        # Physical RAM via sysconf: one libc call, no psutil dependency
+        ram_gb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 ** 3)
         if ram_gb > _HIGH_RAM_THRESHOLD_GB:
             base = int(base * 0.75)
     except Exception:
@@ -64,13 +72,60 @@ ONLY_REWRITE_PARQUET: bool = True  # never touch raw Excel/PDF
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
 def _excluded(p: Path) -> bool:
     s = str(p)
     return any(ex in s for ex in EXCLUDE_PATTERNS)
 
 
-def _non_null_count(row: pd.Series) -> int:
-    return row.notna().sum()
+# Keep string columns in Arrow buffers (no per-value PyObject) on pandas 2.x too;
+# other types convert as usual so date/number handling is unchanged.
+_ARROW_STRING_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+}
+
+
+def _read_partition(pf: Path) -> pd.DataFrame:
+    """Read one parquet file via a memory map, releasing Arrow buffers as columns convert."""
+    table = pq.read_table(pf, memory_map=True, use_threads=True)
+    return table.to_pandas(
+        self_destruct=True, split_blocks=True, types_mapper=_ARROW_STRING_TYPES.get
+    )
+
+
+# fact_perm hive key; kept as string, as when restored from the path by hand
+_PARTITION_SCHEMA = pa.schema([("fiscal_year", pa.string())])
+
+
+def _scan_partitions(perm_dir: Path, files: list[Path]) -> pd.DataFrame | None:
+    """
+    Read all files with one pyarrow dataset scan and a single to_pandas.
+    Returns None when the per-file schemas cannot be combined this way.
+    """
+    try:
+        schemas = [pq.read_schema(pf) for pf in files]
+        try:
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+        except TypeError:  # pyarrow < 14 has no promote_options
+            schema = pa.unify_schemas(schemas)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        return None
+    if "fiscal_year" in schema.names:  # legacy files carry their own fiscal_year
+        return None
+    dataset = ds.dataset(
+        [str(pf) for pf in files],
+        schema=schema.append(_PARTITION_SCHEMA.field("fiscal_year")),
+        format="parquet",
+        partitioning=ds.partitioning(_PARTITION_SCHEMA, flavor="hive"),
+        partition_base_dir=str(perm_dir),
+    )
+    table = dataset.to_table(use_threads=True)
+    return table.to_pandas(
+        self_destruct=True, split_blocks=True, types_mapper=_ARROW_STRING_TYPES.get
+    )
 
 
 def _load_all_partitions(perm_dir: Path) -> pd.DataFrame:
@@ -85,9 +140,17 @@ def _load_all_partitions(perm_dir: Path) -> pd.DataFrame:
     if not files:
         raise FileNotFoundError(f"No parquet files found in {perm_dir}")
 
+    df = _scan_partitions(perm_dir, files)
+    if df is not None:
+        return df
+
+    # Fallback: per-file reads, overlapped since they are dominated by
+    # per-file open/metadata latency
+    with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(files))) as ex:
+        frames = list(ex.map(_read_partition, files))
+
     dfs: list[pd.DataFrame] = []
-    for pf in files:
-        df = pd.read_parquet(pf)
+    for pf, df in zip(files, frames):
         # Restore partition columns from directory names if missing
         for part in pf.parts:
             if "=" in part:
@@ -99,38 +162,69 @@ def _load_all_partitions(perm_dir: Path) -> pd.DataFrame:
     return pd.concat(dfs, ignore_index=True)
 
 
-def _select_best_row(group: pd.DataFrame) -> pd.Series:
+def _date_sort_key(dates: pd.Series) -> pd.Series:
+    """
+    Return a column that sorts like decision_date parsed as a date.
+    Datetime columns are used as-is and ISO 'YYYY-MM-DD...' strings sort
+    correctly as text, so parsing only happens for other formats.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    text = dates.astype("string").str.strip()
+    text = text.where(text.str.len() > 0)
+    present = text.dropna()
+    if present.str.match(_ISO_DATE_RE).all():
+        return text
+    return pd.to_datetime(dates, errors="coerce")
+
+
+def _select_best_rows(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Given a group of rows sharing the same case_number, select the best one.
+    Select the best row per case_number across all groups at once.
     Priority: latest decision_date → most non-nulls → smallest source_file.
+    Output keeps the order in which each case_number first appears.
+
+    The three keys are ranked to integers and packed into one int64, so the
+    winner per case is a hash groupby idxmax instead of a full-frame sort.
     """
-    g = group.copy()
-
-    # Sort key 1: latest decision_date (NaT goes last)
-    if "decision_date" in g.columns:
-        g["_sort_date"] = pd.to_datetime(g["decision_date"], errors="coerce")
-        g = g.sort_values("_sort_date", ascending=False, na_position="last")
-
-    # Sort key 2: most non-null columns (after dropping helper col)
-    non_sort_cols = [c for c in g.columns if not c.startswith("_")]
-    g["_non_null_cnt"] = g[non_sort_cols].apply(_non_null_count, axis=1)
-    g = g.sort_values(
-        ["_sort_date", "_non_null_cnt"],
-        ascending=[False, False],
-        na_position="last",
+    n = len(df)
+    # Dense ranks; missing values rank lowest (-1 → 0 after the shift)
+    date_codes, _ = pd.factorize(_date_sort_key(df["decision_date"]), sort=True)
+    date_rank = date_codes.astype(np.int64) + 1
+    non_null = df.notna().sum(axis=1).to_numpy(dtype=np.int64)
+    nn_base = len(df.columns) + 1
+    if "source_file" in df.columns:
+        src_codes, sources = pd.factorize(df["source_file"], sort=True)
+        # Smaller name → higher priority; missing names lowest
+        src_rank = np.where(src_codes >= 0, len(sources) - src_codes, 0).astype(np.int64)
+        src_base = len(sources) + 1
+    else:
+        src_rank = np.zeros(n, dtype=np.int64)
+        src_base = 1
+
+    priority = pd.Series(
+        (date_rank * nn_base + non_null) * src_base + src_rank, index=np.arange(n)
     )
+    best_pos = priority.groupby(df["case_number"].to_numpy(), sort=False).idxmax()
+    return df.iloc[best_pos.to_numpy()].reset_index(drop=True)
 
-    # Sort key 3: smallest source_file as final tiebreak
-    if "source_file" in g.columns:
-        g = g.sort_values(
-            ["_sort_date", "_non_null_cnt", "source_file"],
-            ascending=[False, False, True],
-            na_position="last",
-        )
 
-    # Keep first row, drop helper columns
-    best = g.iloc[0].drop(labels=["_sort_date", "_non_null_cnt"], errors="ignore")
-    return best
+def _fsync(path: Path, directory: bool = False) -> None:
+    """Flush a file (or a directory entry after a rename) to stable storage."""
+    fd = os.open(path, os.O_RDONLY | (os.O_DIRECTORY if directory else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _concat_as_arrow(frames: list[pd.DataFrame]) -> pa.Table:
+    """Convert each frame to Arrow and splice them (chunk lists, no row copy)."""
+    tables = [pa.Table.from_pandas(f, preserve_index=False) for f in frames]
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except TypeError:  # pyarrow < 14 has no promote_options
+        return pa.concat_tables(tables, promote=True)
 
 
 def build_unique_case(
@@ -153,66 +247,59 @@ def build_unique_case(
     log_lines.append(f"base_count = {base_count:,}")
     print(f"  Loaded {base_count:,} rows")
 
-    # ── Null case_number rows pass through unchanged ──────────────────────────
-    null_mask = df["case_number"].isna()
-    df_null = df[null_mask].copy()
-    df_notnull = df[~null_mask].copy()
-    null_count = len(df_null)
+    # ── Per-row case stats (one groupby; null case_numbers count as 0) ───────
+    null_mask = df["case_number"].isna().to_numpy()
+    by_case = df.groupby("case_number", sort=False)
+    occurrences = by_case["case_number"].transform("size").fillna(0).to_numpy(dtype=np.int64)
+    null_count = int(null_mask.sum())
     log_lines.append(f"null_case_number_rows = {null_count:,}  (passed through)")
     print(f"  Null case_number rows: {null_count:,}  (pass-through)")
 
     # ── Detect cross-FY duplicates ────────────────────────────────────────────
-    if "fiscal_year" in df_notnull.columns:
-        fy_per_case = df_notnull.groupby("case_number")["fiscal_year"].nunique()
-        crossfy_cases = set(fy_per_case[fy_per_case > 1].index.tolist())
+    if "fiscal_year" in df.columns:
+        fy_counts = by_case["fiscal_year"].transform("nunique").fillna(0)
+        crossfy_mask = fy_counts.to_numpy(dtype=np.int64) > 1
     else:
-        crossfy_cases = set()
+        crossfy_mask = np.zeros(len(df), dtype=bool)
+    del by_case
 
-    crossfy_dup_rows = len(df_notnull[df_notnull["case_number"].isin(crossfy_cases)])
-    log_lines.append(f"cross_fy_cases = {len(crossfy_cases):,}  ({crossfy_dup_rows:,} total rows)")
-    print(f"  Cross-FY duplicate case_numbers: {len(crossfy_cases):,}  ({crossfy_dup_rows:,} rows)")
+    crossfy_case_count = df.loc[crossfy_mask, "case_number"].nunique()
+    crossfy_dup_rows = int(crossfy_mask.sum())
+    log_lines.append(f"cross_fy_cases = {crossfy_case_count:,}  ({crossfy_dup_rows:,} total rows)")
+    print(f"  Cross-FY duplicate case_numbers: {crossfy_case_count:,}  ({crossfy_dup_rows:,} rows)")
 
-    # Stamp is_crossfy_duplicate onto df_notnull NOW (before split) using
-    # string-normalised comparison to survive ArrowBacked vs object dtype mismatches.
-    crossfy_str: set[str] = {str(x) for x in crossfy_cases}
-    df_notnull["is_crossfy_duplicate"] = (
-        df_notnull["case_number"].astype(str).isin(crossfy_str)
-    )
-
-    # ── Deduplicate non-null case_numbers ─────────────────────────────────────
-    cn_counts = df_notnull["case_number"].value_counts()
-    single_cases = cn_counts[cn_counts == 1].index
-    multi_cases = cn_counts[cn_counts > 1].index
+    # Stamp is_crossfy_duplicate on the full frame before splitting, so each
+    # part below is a single boolean selection with no follow-up copy.
+    # Null case_number rows are never cross-FY duplicates.
+    df["is_crossfy_duplicate"] = crossfy_mask
 
-    df_single = df_notnull[df_notnull["case_number"].isin(single_cases)].copy()
-    df_multi = df_notnull[df_notnull["case_number"].isin(multi_cases)].copy()
+    # ── Split: null pass-through / single-occurrence / multi-occurrence ──────
+    df_null = df[null_mask]
+    df_single = df[occurrences == 1]
+    df_multi = df[occurrences > 1]
+    del df, occurrences, crossfy_mask
 
     print(f"  Single-occurrence cases: {len(df_single):,}  (no dedup needed)")
     print(f"  Multi-occurrence cases: {len(df_multi):,} rows → selecting best ...")
 
     # Dedup multi-occurrence cases
     if len(df_multi) > 0:
-        best_rows = (
-            df_multi.groupby("case_number", group_keys=False, sort=False)
-            .apply(_select_best_row)
-            .reset_index(drop=True)
-        )
+        best_rows = _select_best_rows(df_multi)
     else:
-        best_rows = df_multi.copy()
+        best_rows = df_multi
 
     removed_count = len(df_multi) - len(best_rows)
     log_lines.append(f"removed_count (multi-oc dedup) = {removed_count:,}")
     print(f"  Removed {removed_count:,} duplicate rows via best-row selection")
 
     # ── Assemble final output ─────────────────────────────────────────────────
-    df_deduped = pd.concat([df_single, best_rows], ignore_index=True)
-    # is_crossfy_duplicate already set on each row above
-
-    # Null pass-through rows
-    df_null["is_crossfy_duplicate"] = False
+    # is_crossfy_duplicate already set on every part above
 
-    df_final = pd.concat([df_deduped, df_null], ignore_index=True)
-    unique_case_count = len(df_final)
+    # Output = single + best + null rows, in that order. The parts are only
+    # joined as Arrow tables at write time (no pandas concat copies).
+    final_parts = [df_single, best_rows, df_null]
+    unique_case_count = sum(len(part) for part in final_parts)
+    crossfy_true = sum(int(part["is_crossfy_duplicate"].sum()) for part in final_parts)
     total_removed = base_count - unique_case_count
     log_lines += [
         f"unique_case_count = {unique_case_count:,}",
@@ -220,13 +307,13 @@ def build_unique_case(
         f"  (= {removed_count:,} dedup + {null_count:,} kept null rows; "
         f"net rows removed = {total_removed:,})",
         "",
-        f"is_crossfy_duplicate=True count: {df_final['is_crossfy_duplicate'].sum():,}",
-        f"columns: {list(df_final.columns)}",
+        f"is_crossfy_duplicate=True count: {crossfy_true:,}",
+        f"columns: {list(df_single.columns)}",
         f"elapsed_sec: {time.perf_counter() - t0:.1f}",
     ]
 
     print(f"\nFinal: {unique_case_count:,} rows  (removed {total_removed:,})")
-    print(f"  is_crossfy_duplicate=True: {df_final['is_crossfy_duplicate'].sum():,}")
+    print(f"  is_crossfy_duplicate=True: {crossfy_true:,}")
 
     if dry_run:
         print("\nDRY RUN — output NOT written")
@@ -243,12 +330,15 @@ def build_unique_case(
     tmp_file = tmp_dir / "part-0.parquet"
 
     print(f"\nWriting → {out_dir}/part-0.parquet ...")
-    df_final.to_parquet(tmp_file, index=False)
+    pq.write_table(_concat_as_arrow(final_parts), tmp_file)
+    _fsync(tmp_file)
+    _fsync(tmp_dir, directory=True)
 
     # Atomic rename: remove existing then rename tmp
     if out_dir.exists():
         shutil.rmtree(out_dir)
     tmp_dir.rename(out_dir)
+    _fsync(out_dir.parent, directory=True)  # make the rename itself durable
     final_file = out_dir / "part-0.parquet"
     print(f"  Written ({final_file.stat().st_size / 1024 / 1024:.1f} MB) [atomic]")
     log_lines.append(f"output: {out_dir}/part-0.parquet")
@@ -4,12 +4,18 @@ import pyarrow.parquet as pq
 
 cutoffs_path = Path('artifacts/tables/fact_cutoffs')
 
+# Only the PK and the columns printed for duplicate groups are needed
+pk_cols = ['bulletin_year', 'bulletin_month', 'chart', 'category', 'country']
+wanted_cols = pk_cols + ['cutoff_date', 'status_flag', 'source_file']
+
 # Read all parquet files and check for PK duplicates
 parquet_files = list(cutoffs_path.rglob('*.parquet'))
 
 all_rows = []
 for pf in parquet_files:
-    tbl = pq.read_table(pf)
+    # Project columns from the footer schema so unused columns are never decoded
+    file_cols = pq.read_schema(pf).names
+    tbl = pq.read_table(pf, columns=[c for c in wanted_cols if c in file_cols] or None)
     df = tbl.to_pandas()
     
     # Restore partition columns
@@ -28,7 +34,6 @@ df_all = pd.concat(all_rows, ignore_index=True)
 print(f'Total rows: {len(df_all)}')
 
 # Check PK uniqueness
-pk_cols = ['bulletin_year', 'bulletin_month', 'chart', 'category', 'country']
 if all(c in df_all.columns for c in pk_cols):
     # Find duplicates
     duplicates = df_all[df_all.duplicated(subset=pk_cols, keep=False)]
@@ -23,6 +23,7 @@ from __future__ import annotations
 
 import json
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 import pyarrow.parquet as pq
@@ -56,8 +57,8 @@ def main() -> None:
 
     # Enumerate all leaf parquet files under bulletin_year=*/bulletin_month=*/
     leaf_dirs: set[tuple[str, str]] = set()
+    months_by_year: dict[str, set[str]] = defaultdict(set)
     total_rows = 0
-    years: set[str] = set()
 
     parquet_files = sorted(
         f for f in FACT_CUTOFFS_DIR.rglob("*.parquet")
@@ -73,11 +74,11 @@ def main() -> None:
         bm = next((p.split("=")[1] for p in pf.parts if p.startswith("bulletin_month=")), None)
         if by and bm:
             leaf_dirs.add((by, bm))
-            years.add(by)
+            months_by_year[by].add(bm)
         total_rows += _row_count(pf)
 
     n_leaves = len(leaf_dirs)
-    year_list = sorted(years)
+    year_list = sorted(months_by_year)
     min_year = year_list[0] if year_list else "N/A"
     max_year = year_list[-1] if year_list else "N/A"
     n_years  = len(year_list)
@@ -95,7 +96,7 @@ def main() -> None:
     print(f"\nLeaf-partition detail ({n_years} years × up to 12 months = {n_leaves} found):",
           file=sys.stderr)
     for yr in year_list:
-        months = sorted(bm for (by, bm) in leaf_dirs if by == yr)
+        months = sorted(months_by_year[yr])
         print(f"  {yr}: {','.join(months)}  ({len(months)} leaves)", file=sys.stderr)
 
     # ── Fail-fast criteria ────────────────────────────────────────────────────
@@ -17,18 +17,23 @@ Dedup priority (keep first):
   2. Most non-null values across all columns (most complete record)
   3. Lexicographically smallest source_file (deterministic tiebreak)
 
-Writes are atomic: tmp file → unlink original → rename.
+Writes are atomic: tmp file → fsync → os.replace over the original.
 
 Usage:
     python3 scripts/fix_fact_perm_pk.py [--dry-run] [--report artifacts/metrics/perm_pk_report.md]
 """
 import argparse
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 ROOT = Path(__file__).resolve().parent.parent
 ARTIFACTS = ROOT / "artifacts"
@@ -53,12 +58,71 @@ def _partition_key(leaf: Path) -> str | None:
     return None
 
 
+def _fsync(path: Path, directory: bool = False) -> None:
+    """Flush a file (or a directory entry after a rename) to stable storage."""
+    fd = os.open(path, os.O_RDONLY | (os.O_DIRECTORY if directory else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _valid_mask(col: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Non-null mask matching pandas notna() (float NaN counts as missing)."""
+    valid = pc.is_valid(col)
+    if pa.types.is_floating(col.type):
+        valid = pc.and_kleene(valid, pc.invert(pc.is_nan(col)))
+    return valid
+
+
+def _dedup_table(tbl: pa.Table) -> pa.Table:
+    """Keep the highest-priority row per case_number, entirely in Arrow compute.
+
+    Priority (first wins): latest decision_date (nulls last), most non-null
+    values, smallest source_file. Null case_numbers collapse into one group,
+    as drop_duplicates did.
+    """
+    names = tbl.column_names
+    keys = {}
+    if "decision_date" in names:
+        dd = tbl["decision_date"]
+        if not (pa.types.is_timestamp(dd.type) or pa.types.is_date(dd.type)):
+            dd = pa.chunked_array([pa.array(pd.to_datetime(dd.to_pandas(), errors="coerce"))])
+        keys["_dd"] = dd
+    nonnull = pc.cast(_valid_mask(tbl[names[0]]), pa.int32())
+    for name in names[1:]:
+        nonnull = pc.add(nonnull, pc.cast(_valid_mask(tbl[name]), pa.int32()))
+    keys["_nn"] = nonnull
+    if "source_file" in names:
+        # Few distinct file names: sort the dictionary once and tiebreak on
+        # each row's integer rank instead of comparing strings per row.
+        src = pc.fill_null(pc.cast(tbl["source_file"], pa.string()), "")
+        enc = src.combine_chunks().dictionary_encode()
+        keys["_src"] = pc.take(pc.rank(enc.dictionary, sort_keys="ascending"), enc.indices)
+
+    order = pc.sort_indices(
+        pa.table(keys),
+        sort_keys=[(k, "ascending" if k == "_src" else "descending") for k in keys],
+    )  # nulls sort at_end by default
+    ranked = tbl.take(order)
+
+    # First row per case_number in ranked order, emitted in that same order.
+    firsts = (
+        pa.table({"case_number": ranked["case_number"],
+                  "_row": pa.array(range(ranked.num_rows), pa.int64())})
+        .group_by("case_number")
+        .aggregate([("_row", "min")])["_row_min"]
+    )
+    return ranked.take(pc.take(firsts, pc.sort_indices(firsts)))
+
+
 def dedup_partition(pf: Path, fy: str, dry_run: bool) -> dict:
     """Deduplicate a single parquet file on case_number. Returns stats dict."""
-    df = pd.read_parquet(pf)
-    before = len(df)
+    # Footer-only read: schema and row count without decoding any pages.
+    meta = pq.ParquetFile(pf)
+    before = meta.metadata.num_rows
 
-    if "case_number" not in df.columns:
+    if "case_number" not in meta.schema_arrow.names:
         return {"file": str(pf), "fy": fy, "before": before, "after": before,
                 "removed": 0, "note": "SKIP: no case_number column"}
 
@@ -66,41 +130,27 @@ def dedup_partition(pf: Path, fy: str, dry_run: bool) -> dict:
         return {"file": str(pf), "fy": fy, "before": 0, "after": 0,
                 "removed": 0, "note": "SKIP: empty file"}
 
-    # Sort priority: latest decision_date first, then most non-nulls, then source_file asc
-    if "decision_date" in df.columns:
-        df["decision_date"] = pd.to_datetime(df["decision_date"], errors="coerce")
-        df["_dd_sort"] = df["decision_date"].apply(
-            lambda x: x.timestamp() if pd.notna(x) else -1e18
-        )
-    else:
-        df["_dd_sort"] = 0.0
-
-    df["_nonnull_count"] = df.notna().sum(axis=1)
-    df["_src"] = df["source_file"].fillna("") if "source_file" in df.columns else ""
+    # Most partitions are already clean — check the key column alone before
+    # decoding the full file.
+    # count_distinct(mode="all") counts null as one value, so repeated nulls
+    # register as duplicates exactly as pandas duplicated() did.
+    keys = pq.read_table(pf, columns=["case_number"])["case_number"]
+    if pc.count_distinct(keys, mode="all").as_py() == len(keys):
+        return {"file": pf.name, "fy": fy, "before": before, "after": before,
+                "removed": 0, "note": "OK"}
 
-    df.sort_values(
-        ["_dd_sort", "_nonnull_count", "_src"],
-        ascending=[False, False, True],
-        inplace=True,
-    )
-    df.drop_duplicates(subset=["case_number"], keep="first", inplace=True)
-    df.drop(columns=["_dd_sort", "_nonnull_count", "_src"], inplace=True)
-    df.reset_index(drop=True, inplace=True)
+    tbl = _dedup_table(pq.read_table(pf))
 
-    after = len(df)
+    after = tbl.num_rows
     removed = before - after
 
     if removed > 0 and not dry_run:
         ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         tmp = pf.parent / f".tmp_{ts}_{pf.name}"
-        df.to_parquet(tmp, index=False)
-        pf.unlink()
-        tmp.rename(pf)
-        log.info(f"  [{fy}] {pf.name}: {before:,} → {after:,} rows (removed {removed:,})")
-    elif removed > 0:
-        log.info(f"  [{fy}] DRY-RUN {pf.name}: would remove {removed:,} dups")
-    else:
-        log.info(f"  [{fy}] {pf.name}: CLEAN ({before:,} rows, 0 dups)")
+        pq.write_table(tbl, tmp)
+        _fsync(tmp)
+        os.replace(tmp, pf)  # atomic overwrite; no window without the partition file
+        _fsync(pf.parent, directory=True)
 
     return {
         "file": pf.name,
@@ -112,6 +162,22 @@ def dedup_partition(pf: Path, fy: str, dry_run: bool) -> dict:
     }
 
 
+def _result_line(r: dict, dry_run: bool) -> str:
+    """One log line per file; emitted by main so output order is stable."""
+    if r["note"] != "OK":
+        return f"  [{r['fy']}] {Path(r['file']).name}: {r['note']}"
+    if r["removed"] == 0:
+        return f"  [{r['fy']}] {r['file']}: CLEAN ({r['before']:,} rows, 0 dups)"
+    if dry_run:
+        return f"  [{r['fy']}] DRY-RUN {r['file']}: would remove {r['removed']:,} dups"
+    return f"  [{r['fy']}] {r['file']}: {r['before']:,} → {r['after']:,} rows (removed {r['removed']:,})"
+
+
+def _dedup_leaf(pf: Path, dry_run: bool) -> dict:
+    """Worker entry point: one partition file per task."""
+    return dedup_partition(pf, _partition_key(pf) or "unknown", dry_run=dry_run)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Enforce within-partition case_number uniqueness in fact_perm")
     parser.add_argument("--dry-run", action="store_true", help="Analyse only; do not write files")
@@ -120,6 +186,10 @@ def main():
         default="artifacts/metrics/perm_pk_report.md",
         help="Output markdown report path",
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes for per-file dedup (default: min(8, os.cpu_count()))",
+    )
     args = parser.parse_args()
 
     ts = datetime.now(timezone.utc).isoformat()
@@ -134,15 +204,16 @@ def main():
     )
     log.info(f"Found {len(leaves)} partition file(s)")
 
-    results = []
-    total_before = total_after = 0
+    # Each partition file is independent — fan out one task per file. Workers
+    # only return stats; logging happens here, in leaf order.
+    workers = args.workers or min(8, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_dedup_leaf, leaves, [args.dry_run] * len(leaves)))
+    for r in results:
+        log.info(_result_line(r, args.dry_run))
 
-    for pf in leaves:
-        fy = _partition_key(pf) or "unknown"
-        stats = dedup_partition(pf, fy, dry_run=args.dry_run)
-        results.append(stats)
-        total_before += stats["before"]
-        total_after += stats["after"]
+    total_before = sum(r["before"] for r in results)
+    total_after = sum(r["after"] for r in results)
 
     total_removed = total_before - total_after
     pass_flag = "PASS" if total_removed == 0 else f"FIXED ({total_removed:,} dups removed)"
@@ -186,7 +257,7 @@ def main():
         "- PK enforced: **(case_number)** within each `fiscal_year=XXXX` partition.",
         "- Cross-FY duplicate case_numbers are **intentional** (DOL annual disclosure overlap).",
         "- Dedup priority: latest `decision_date` > most non-null values > smallest `source_file`.",
-        "- Writes are atomic (tmp → unlink → rename).",
+        "- Writes are atomic (tmp → fsync → os.replace).",
     ]
     report_path.write_text("\n".join(lines) + "\n")
     log.info(f"Report written: {report_path}")
@@ -10,17 +10,38 @@ Run:  python scripts/generate_artifact_catalog.py
 """
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
+try:
+    import orjson  # optional: C serializer, byte-identical to the json.dump fallback
+except ImportError:
+    orjson = None  # type: ignore
+
 ROOT = Path(__file__).resolve().parent.parent
 TABLES = ROOT / "artifacts" / "tables"
 METRICS = ROOT / "artifacts" / "metrics"
 METRICS.mkdir(parents=True, exist_ok=True)
+_ROOT_PREFIX = str(ROOT) + os.sep  # sliced off instead of Path.relative_to per entry
+
+_PRINT_LOCK = threading.Lock()
+
+# Footer-derived {schema, row_count} per dataset, reused across runs while the
+# dataset's file signature (paths, sizes, mtimes) is unchanged.
+CACHE_PATH = METRICS / ".catalog_cache.json"
+_CACHE_VERSION = 2  # bump whenever the cached schema/row_count derivation changes
+_FOOTER_CACHE: dict[str, dict] = {}
 
 
 # Declared intended charts for each dataset
@@ -89,36 +110,228 @@ PARTITION_KEYS: dict[str, list[str]] = {
 }
 
 
-def _get_schema(path: Path) -> dict[str, str]:
-    """Get field:type dict from a parquet file."""
+def _read_footer(path: str) -> pq.FileMetaData | None:
+    """Parse a standalone footer file (the _metadata sidecar); None on error."""
+    try:
+        return pq.read_metadata(path)
+    except Exception:
+        return None
+
+
+def _read_file(path: str) -> tuple[dict[str, str], int]:
+    """field:type and row count of one parquet file from a single open.
+
+    ParquetFile parses the footer once; schema_arrow and metadata are both
+    built from it. Returns ({}, -1) if the file cannot be read.
+    """
+    try:
+        with pq.ParquetFile(path) as pf:
+            schema = {field.name: str(field.type) for field in pf.schema_arrow}
+            return schema, pf.metadata.num_rows
+    except Exception:
+        return {}, -1
+
+
+def _get_schema(footer: pq.FileMetaData | None) -> dict[str, str]:
+    """Get field:type dict from a parsed parquet footer."""
+    try:
+        return {field.name: str(field.type) for field in footer.schema.to_arrow_schema()}
+    except Exception:
+        return {}
+
+
+def _iter_parquet(path: str) -> Iterator[os.DirEntry]:
+    """Yield DirEntry objects for every *.parquet file under path (recursive).
+
+    os.scandir returns file type with the directory listing, so no per-entry
+    stat() is issued the way rglob + is_file() does.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_parquet(entry.path)
+            elif entry.name.endswith(".parquet") and entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+@dataclass
+class _DatasetScan:
+    """Everything main() needs from one walk of a dataset."""
+    files: list[str]                  # parquet file paths
+    mtime: float                      # newest file mtime
+    sample: str | None                # schema sample (None: no parquet files)
+    signature: str                    # footer-cache key over (path, size, mtime_ns)
+    partition_key: str | None = None  # first top-level hive key seen, if any
+
+
+def _scan_dataset(path: str, is_dir: bool) -> _DatasetScan:
+    """Single walk of a dataset.
+
+    The signature hashes every file's (relative path, size, mtime_ns) from the
+    stat the walk already does; it keys the footer cache. The first top-level
+    ``key=value`` directory seen gives the auto-detected partition key. A
+    single .parquet file is its own one-file dataset.
+    """
+    if not is_dir:
+        st = os.stat(path)
+        name = os.path.basename(path)
+        sig = hashlib.sha1(f"{name}\0{st.st_size}\0{st.st_mtime_ns}".encode()).hexdigest()
+        return _DatasetScan([path], st.st_mtime, path, sig)
+    files: list[str] = []
+    stamps: list[str] = []
+    max_mtime = 0.0
+    part_key = None
+    cut = len(path) + 1  # walk paths are path + os.sep + relative part
+    for entry in _iter_parquet(path):
+        st = entry.stat()
+        rel = entry.path[cut:]
+        files.append(entry.path)
+        stamps.append(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}")
+        max_mtime = max(max_mtime, st.st_mtime)
+        if part_key is None:
+            top = rel.split(os.sep, 1)
+            if len(top) == 2 and "=" in top[0]:
+                part_key = top[0].split("=")[0]
+    sig = hashlib.sha1("\n".join(sorted(stamps)).encode()).hexdigest()
+    # Schema sample: the first file the walk reached (partitions share a schema)
+    return _DatasetScan(files, max_mtime, files[0] if files else None, sig, part_key)
+
+
+def _load_cache() -> dict[str, dict]:
     try:
-        meta = pq.read_schema(path)
-        return {field.name: str(field.type) for field in meta}
+        cache = json.loads(CACHE_PATH.read_text())
     except Exception:
         return {}
+    if not isinstance(cache, dict) or cache.get("version") != _CACHE_VERSION:
+        return {}
+    return cache.get("datasets", {})
+
+
+def _read_sidecar(path: str, files: list[str]) -> pq.FileMetaData | None:
+    """Return the dataset's _metadata footer if it covers exactly these files.
+
+    A stale sidecar (files added or removed since it was written) is ignored
+    so row counts never drift from what is on disk.
+    """
+    meta_path = os.path.join(path, "_metadata")
+    if not os.path.isfile(meta_path):
+        return None
+    meta = _read_footer(meta_path)
+    if meta is None:
+        return None
+    covered = {meta.row_group(i).column(0).file_path for i in range(meta.num_row_groups)}
+    cut = len(path) + 1
+    on_disk = {pf[cut:].replace(os.sep, "/") for pf in files}
+    return meta if covered == on_disk else None
+
 
+def _footer_rows(pf: str) -> int:
+    return pq.read_metadata(pf).num_rows
 
-def _get_row_count(path: Path) -> int:
+
+def _get_row_count(files: list[str]) -> int:
+    """Sum footer row counts; footers are read concurrently (I/O-bound)."""
     try:
-        if path.is_dir():
-            total = 0
-            for pf in sorted(path.rglob("*.parquet")):
-                total += pq.read_metadata(pf).num_rows
-            return total
-        return pq.read_metadata(path).num_rows
+        if len(files) <= 1:
+            return sum(_footer_rows(pf) for pf in files)
+        with ThreadPoolExecutor(max_workers=min(16, len(files))) as ex:
+            return sum(ex.map(_footer_rows, files))
     except Exception:
         return -1
 
 
-def _get_last_modified(path: Path) -> str:
+def _format_mtime(mtime: float) -> str:
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
+
+
+def _open_dataset(path: str, files: list[str]) -> ds.Dataset | None:
+    """pyarrow dataset over the walked files, with hive partition columns.
+
+    Partition values live in directory names, not in file footers, so only the
+    dataset schema carries them. The walked file list is passed in (no second
+    listing) and one fragment is inspected. Returns None when discovery fails,
+    e.g. a file column clashing with a partition key.
+    """
     try:
-        if path.is_dir():
-            mtime = max(pf.stat().st_mtime for pf in path.rglob("*.parquet"))
-        else:
-            mtime = path.stat().st_mtime
-        return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
+        return ds.dataset(files, format="parquet", partitioning="hive",
+                          partition_base_dir=path)
     except Exception:
-        return "unknown"
+        return None
+
+
+def _read_dataset_footers(
+    path: str, is_dir: bool, files: list[str], schema_path: str
+) -> tuple[dict[str, str], int]:
+    """Schema and total row count from parquet footers (row_count -1 on error)."""
+    if not is_dir:
+        return _read_file(path)
+
+    sidecar = _read_sidecar(path, files)
+    dataset = _open_dataset(path, files)
+    if sidecar is not None:
+        # Dataset-level _metadata already aggregates every file footer
+        row_count = sidecar.num_rows
+    elif dataset is not None:
+        # Metadata-only count; Arrow reads the fragment footers on its own
+        # thread pool instead of one synchronous read_metadata per file.
+        try:
+            row_count = dataset.count_rows()
+        except Exception:
+            row_count = -1
+    else:
+        row_count = _get_row_count(files)
+
+    if dataset is not None:
+        schema = {field.name: str(field.type) for field in dataset.schema}
+    elif sidecar is not None:
+        schema = _get_schema(sidecar)
+    else:
+        schema = _read_file(schema_path)[0]
+    return schema, row_count
+
+
+def _catalog_one(item: tuple[str, str, bool]) -> dict | None:
+    """Build the catalog entry for one dataset (None if it has no parquet files)."""
+    name, path, is_dir = item
+    with _PRINT_LOCK:
+        print(f"  Cataloging: {name} …")
+
+    # One walk gives files, mtime, schema sample, signature and partition key
+    scan = _scan_dataset(path, is_dir)
+    if scan.sample is None:
+        return None
+
+    rel_path = path[len(_ROOT_PREFIX):]
+    cached = _FOOTER_CACHE.get(rel_path)
+    if cached is not None and cached.get("signature") == scan.signature:
+        # No file added, removed, resized or touched since the last run
+        schema, row_count = cached["schema"], cached["row_count"]
+    else:
+        schema, row_count = _read_dataset_footers(path, is_dir, scan.files, scan.sample)
+        if row_count >= 0:
+            _FOOTER_CACHE[rel_path] = {
+                "signature": scan.signature, "schema": schema, "row_count": row_count,
+            }
+    last_updated = _format_mtime(scan.mtime)
+
+    # Partition keys: declared, else auto-detected during the walk. Copy the
+    # declared list so an entry never aliases (or grows) the module constant.
+    if name in PARTITION_KEYS:
+        part_keys = list(PARTITION_KEYS[name])
+    else:
+        part_keys = [scan.partition_key] if scan.partition_key is not None else []
+
+    return {
+        "name": name,
+        "path": rel_path,
+        "type": "partitioned_directory" if is_dir else "single_file",
+        "schema": schema,
+        "row_count": row_count,
+        "num_columns": len(schema),
+        "partition_keys": part_keys,
+        "last_updated": last_updated,
+        "intended_charts": INTENDED_CHARTS.get(name, []),
+    }
 
 
 def main() -> None:
@@ -128,64 +341,48 @@ def main() -> None:
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
 
-    catalog: list[dict] = []
-
     # Collect all parquet tables and directories
-    all_items: list[tuple[str, Path]] = []
+    # (name, path, is_dir) — plain strings from here on; the is_dir flag is
+    # taken once from the listing instead of re-stat'ing the path per use.
+    all_items: list[tuple[str, str, bool]] = []
 
-    for item in sorted(TABLES.iterdir()):
-        name = item.stem if item.suffix == ".parquet" else item.name
-        if item.name.startswith("_") or item.suffix in (".json", ".log", ".tmp"):
+    # scandir reports entry types with the listing (no stat per item)
+    with os.scandir(TABLES) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        stem, suffix = os.path.splitext(entry.name)
+        if entry.name.startswith("_") or suffix in (".json", ".log", ".tmp"):
             continue
-        if item.suffix == ".parquet" or item.is_dir():
-            all_items.append((name, item))
+        is_dir = entry.is_dir()
+        if suffix == ".parquet":
+            all_items.append((stem, entry.path, is_dir))
+        elif is_dir:
+            all_items.append((entry.name, entry.path, is_dir))
 
-    for name, path in all_items:
-        print(f"  Cataloging: {name} …")
+    _FOOTER_CACHE.update(_load_cache())
 
-        # Schema: use first file found for dirs
-        schema_path = path
-        if path.is_dir():
-            files = sorted(path.rglob("*.parquet"))
-            if files:
-                schema_path = files[0]
-            else:
-                continue
-
-        schema = _get_schema(schema_path)
-        row_count = _get_row_count(path)
-        last_updated = _get_last_modified(path)
-
-        # Partition keys: from directory structure
-        part_keys = PARTITION_KEYS.get(name, [])
-        if path.is_dir() and not part_keys:
-            # Auto-detect from directory names
-            for sub in sorted(path.iterdir()):
-                if sub.is_dir() and "=" in sub.name:
-                    part_keys.append(sub.name.split("=")[0])
-                    break
-
-        entry = {
-            "name": name,
-            "path": str(path.relative_to(ROOT)),
-            "type": "partitioned_directory" if path.is_dir() else "single_file",
-            "schema": schema,
-            "row_count": row_count,
-            "num_columns": len(schema),
-            "partition_keys": part_keys,
-            "last_updated": last_updated,
-            "intended_charts": INTENDED_CHARTS.get(name, []),
-        }
-        catalog.append(entry)
+    # Footer reads block on I/O (GIL released), so catalog datasets
+    # concurrently; map() keeps the output in all_items order.
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(all_items)))) as ex:
+        catalog = [entry for entry in ex.map(_catalog_one, all_items) if entry is not None]
 
     # Write catalog
     out_path = METRICS / "p3_artifact_catalog.json"
-    with open(out_path, "w") as fh:
-        json.dump({
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "total_artifacts": len(catalog),
-            "artifacts": catalog,
-        }, fh, indent=2)
+    payload = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "total_artifacts": len(catalog),
+        "artifacts": catalog,
+    }
+    if orjson is not None:
+        out_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        # ensure_ascii=False + UTF-8 so the bytes match orjson's raw UTF-8 output
+        with open(out_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2, ensure_ascii=False)
+
+    # Persist only datasets that still exist, so removed tables drop out
+    live = {e["path"]: _FOOTER_CACHE[e["path"]] for e in catalog if e["path"] in _FOOTER_CACHE}
+    CACHE_PATH.write_text(json.dumps({"version": _CACHE_VERSION, "datasets": live}))
 
     elapsed = time.time() - t0
     print(f"\n✓ Catalog written: {out_path.relative_to(ROOT)}")
@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """Generate the final consolidated FINAL_SINGLE_REPORT.md with ALL required sections."""
+import functools
 import json
+import os
+import re
 import subprocess
 import sys
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import yaml
 
 # ── Commentary capture (permanent) ───────────────────────────────────────────
@@ -24,10 +31,138 @@ try:
 except Exception:
     _transcript = None  # type: ignore
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Columns the report actually inspects; everything else is never read.
+OEWS_COLS = ["ref_year", "h_mean", "a_mean", "a_pct10", "soc_code", "area_code"]
+LCA_COLS = ["fiscal_year", "case_status", "visa_class", "employer_id",
+            "soc_code", "wage_rate_from", "source_file"]
+EFS_COLS = ["employer_name", "efs", "efs_tier", "n_24m", "approval_rate_24m",
+            "outcome_subscore", "wage_subscore", "sustainability_subscore"]
+
+# Whole log lines mentioning WARN / ERROR / FAIL in any case; matched on raw
+# bytes so a log is never decoded or upper-cased line by line.
+_WARN_ERROR_LINE = re.compile(rb"^[^\n]*?(?:WARN|ERROR|FAIL)[^\n]*", re.IGNORECASE | re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_yaml(path: str) -> dict:
+    """Parse a config file once per process (C loader when available)."""
+    with open(path) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+def _unify(schemas: list[pa.Schema]) -> pa.Schema:
+    try:
+        # Permissive promotion merges e.g. a null-typed column (an FY written
+        # without it) with the double it holds elsewhere
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except TypeError:  # pyarrow < 14 has no promote_options
+        return pa.unify_schemas(schemas)
+
+
+def _unify_file_schemas(pfiles: list[str], partitioning) -> pa.Schema:
+    """One schema over every file footer, plus the hive partition fields."""
+    schema = _unify([pq.read_schema(pf) for pf in pfiles])
+    for field in partitioning.schema:
+        if field.name not in schema.names:
+            schema = schema.append(field)
+    return schema
+
+
+def _read_per_file(path: Path, pfiles: list[str], partitioning):
+    """Read file by file when the footers cannot be unified.
+
+    Columns whose types cannot be merged (e.g. string in one FY, int64 in
+    another) are read as strings everywhere; the rest are concatenated with
+    the usual promotion. Returns an in-memory dataset.
+    """
+    tables = [ds.dataset([pf], format="parquet", partitioning=partitioning,
+                         partition_base_dir=str(path)).to_table() for pf in pfiles]
+    types: dict[str, set] = {}
+    for t in tables:
+        for field in t.schema:
+            types.setdefault(field.name, set()).add(field.type)
+    clashing = set()
+    for name, field_types in types.items():
+        try:
+            _unify([pa.schema([pa.field(name, t)]) for t in field_types])
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            clashing.add(name)
+    tables = [
+        t.cast(pa.schema([pa.field(f.name, pa.string()) if f.name in clashing else f
+                          for f in t.schema]))
+        for t in tables
+    ]
+    try:
+        table = pa.concat_tables(tables, promote_options="permissive")
+    except TypeError:  # pyarrow < 14
+        table = pa.concat_tables(tables, promote=True)
+    return ds.dataset(table)
+
+
+def _open_table(path: Path):
+    """pyarrow dataset over a parquet file or a hive-partitioned directory.
+
+    Partition columns (ref_year=, fiscal_year=) come back as real columns, so
+    callers can project with ``to_table(columns=...)`` instead of reading every
+    file in full. The schema is unified over all file footers, so a column
+    missing from (or null-typed in) some partitions is still read. Falls back
+    to reading file by file if the footers cannot be unified. Returns None
+    when there is nothing to read.
+    """
+    if path.is_file():
+        return ds.dataset(str(path), format="parquet")
+    if path.is_dir():
+        pfiles = [str(pf) for pf in path.rglob("*.parquet")]
+        if pfiles:
+            # Discovery only inspects one file; it is used for the partition types
+            found = ds.dataset(pfiles, format="parquet", partitioning="hive",
+                               partition_base_dir=str(path))
+            try:
+                schema = _unify_file_schemas(pfiles, found.partitioning)
+            except (pa.ArrowTypeError, pa.ArrowInvalid) as e:
+                print(f"  {path.name}: file schemas differ ({e}); reading file by file")
+                return _read_per_file(path, pfiles, found.partitioning)
+            return ds.dataset(pfiles, schema=schema, format="parquet",
+                              partitioning=found.partitioning, partition_base_dir=str(path))
+    return None
+
+
+def _project(dataset, columns, filter=None):
+    """Read only the listed columns that exist in the dataset schema."""
+    return dataset.to_table(columns=[c for c in columns if c in dataset.schema.names],
+                            filter=filter)
+
+
+def _notna(col):
+    """Non-missing mask with pandas semantics (NaN counts as missing)."""
+    return pc.invert(pc.is_null(col, nan_is_null=True))
+
+
+def _count(mask) -> int:
+    return pc.sum(mask, min_count=0).as_py()
+
+
+def _value_counts(col) -> list[tuple]:
+    """(value, count) pairs like Series.value_counts(): nulls dropped, most frequent first."""
+    vc = pc.value_counts(col)
+    pairs = zip(vc.field("values").to_pylist(), vc.field("counts").to_pylist())
+    return sorted(((v, n) for v, n in pairs if v is not None), key=lambda vn: -vn[1])
+
 
 def main():
-    with open("configs/paths.yaml") as f:
-        paths = yaml.safe_load(f)
+    # ── STEP A (start): VB parity check ───────────────────
+    # check_vb_parity.py only reads the VB tables, so it runs in the background
+    # while the sections below scan OEWS/EFS/LCA; its exit code is awaited
+    # (fail-fast) before anything is written.
+    _scripts_dir = Path(__file__).resolve().parent
+    _parity_proc = subprocess.Popen([sys.executable, str(_scripts_dir / "check_vb_parity.py")])
+
+    paths = _load_yaml("configs/paths.yaml")
     data_root = Path(paths["data_root"])
     artifacts_root = Path(paths["artifacts_root"])
     metrics_dir = artifacts_root / "metrics"
@@ -58,15 +193,23 @@ def main():
                 manifest_derived[tname] = tinfo
     _manifest = _manifest_full
 
-    with open("configs/audit.yml") as f:
-        audit_cfg = yaml.safe_load(f)
+    audit_cfg = _load_yaml("configs/audit.yml")
     thresholds = audit_cfg.get('coverage_thresholds', {})
 
     # ── Helper: read log lines ────────────────────────────
+    # One listing of the metrics logs; each file is read at most once and the
+    # bytes are shared by read_log, the WARN/ERROR scan and the unique-case stats.
+    log_index = {lp.name: lp for lp in sorted(metrics_dir.glob("*.log"))}
+    log_cache: dict[str, bytes] = {}
+
+    def log_bytes(name):
+        if name not in log_cache:
+            log_cache[name] = log_index[name].read_bytes()
+        return log_cache[name]
+
     def read_log(name, max_lines=100):
-        lp = metrics_dir / name
-        if lp.exists():
-            return lp.read_text().splitlines()[:max_lines]
+        if name in log_index:
+            return log_bytes(name).decode().splitlines()[:max_lines]
         return ["(not found)"]
 
     perm_log = read_log("fact_perm_reconcile.log", 100)
@@ -79,58 +222,44 @@ def main():
     try:
         fact_oews_path = artifacts_root / "tables" / "fact_oews.parquet"
         fact_oews_dir = artifacts_root / "tables" / "fact_oews"
-        df_oews = None
-        if fact_oews_path.exists() and fact_oews_path.is_file():
-            df_oews = pd.read_parquet(fact_oews_path)
-        elif fact_oews_dir.exists() and fact_oews_dir.is_dir():
-            # Partitioned directory — read all parquet files and restore partitions
-            pfiles = list(fact_oews_dir.rglob("*.parquet"))
-            if pfiles:
-                dfs = []
-                for pf in pfiles:
-                    pdf = pd.read_parquet(pf)
-                    for part in pf.parts:
-                        if '=' in part:
-                            col_name, col_value = part.split('=', 1)
-                            if col_name not in pdf.columns:
-                                pdf[col_name] = col_value
-                    dfs.append(pdf)
-                df_oews = pd.concat(dfs, ignore_index=True)
-        if df_oews is not None:
-            oews_lines.append(f"Total rows: {len(df_oews):,}")
+        oews_ds = _open_table(fact_oews_path) or _open_table(fact_oews_dir)
+        if oews_ds is not None:
+            tbl = _project(oews_ds, OEWS_COLS)
+            cols = tbl.column_names
+            n_oews = tbl.num_rows
+            oews_lines.append(f"Total rows: {n_oews:,}")
 
             # ref_year breakdown
-            if 'ref_year' in df_oews.columns:
-                for yr, cnt in df_oews['ref_year'].value_counts().sort_index().items():
+            if 'ref_year' in cols:
+                for yr, cnt in sorted(_value_counts(tbl['ref_year'])):
                     oews_lines.append(f"  ref_year={yr}: {cnt:,} rows")
             else:
                 oews_lines.append("  (ref_year column not present)")
 
             # Hourly→annual conversion stats
-            if 'h_mean' in df_oews.columns and 'a_mean' in df_oews.columns:
-                has_hourly = df_oews['h_mean'].notna().sum()
-                has_annual = df_oews['a_mean'].notna().sum()
+            if 'h_mean' in cols and 'a_mean' in cols:
+                h_ok = _notna(tbl['h_mean'])
+                a_ok = _notna(tbl['a_mean'])
                 oews_lines.append(f"\nHourly-to-Annual conversions:")
-                oews_lines.append(f"  Rows with h_mean: {has_hourly:,}")
-                oews_lines.append(f"  Rows with a_mean: {has_annual:,}")
-                both = (df_oews['h_mean'].notna() & df_oews['a_mean'].notna()).sum()
-                oews_lines.append(f"  Rows with both:   {both:,}")
-                if 'a_pct10' in df_oews.columns:
-                    oews_lines.append(f"  Rows with a_pct10: {df_oews['a_pct10'].notna().sum():,}")
+                oews_lines.append(f"  Rows with h_mean: {_count(h_ok):,}")
+                oews_lines.append(f"  Rows with a_mean: {_count(a_ok):,}")
+                oews_lines.append(f"  Rows with both:   {_count(pc.and_(h_ok, a_ok)):,}")
+                if 'a_pct10' in cols:
+                    oews_lines.append(f"  Rows with a_pct10: {_count(_notna(tbl['a_pct10'])):,}")
             else:
                 oews_lines.append("\nWage columns present: " + ", ".join(
-                    [c for c in df_oews.columns if c.startswith(('h_', 'a_', 'wage', 'pct'))]))
+                    [c for c in oews_ds.schema.names if c.startswith(('h_', 'a_', 'wage', 'pct'))]))
 
             # Missing-key stats (FK joins)
             oews_lines.append("\nMissing-key stats:")
-            if 'soc_code' in df_oews.columns:
-                soc_null = df_oews['soc_code'].isna().sum()
-                oews_lines.append(f"  soc_code null: {soc_null:,} ({soc_null/len(df_oews)*100:.1f}%)")
-            if 'area_code' in df_oews.columns:
-                area_null = df_oews['area_code'].isna().sum()
-                oews_lines.append(f"  area_code null: {area_null:,} ({area_null/len(df_oews)*100:.1f}%)")
-
-            oews_lines.append(f"\nColumns: {list(df_oews.columns)}")
+            if 'soc_code' in cols:
+                soc_null = n_oews - _count(_notna(tbl['soc_code']))
+                oews_lines.append(f"  soc_code null: {soc_null:,} ({soc_null/n_oews*100:.1f}%)")
+            if 'area_code' in cols:
+                area_null = n_oews - _count(_notna(tbl['area_code']))
+                oews_lines.append(f"  area_code null: {area_null:,} ({area_null/n_oews*100:.1f}%)")
+
+            oews_lines.append(f"\nColumns: {oews_ds.schema.names}")
         else:
             oews_lines.append("fact_oews.parquet not found")
     except Exception as e:
@@ -142,35 +271,44 @@ def main():
     try:
         score_path = artifacts_root / "tables" / "employer_friendliness_scores.parquet"
         if score_path.exists():
-            df_efs = pd.read_parquet(score_path)
-            overall = df_efs[df_efs['scope'] == 'overall']
+            efs_ds = _open_table(score_path)
+            n_efs = efs_ds.count_rows()
+            # Only overall-scope rows feed the stats; filter in the scan
+            overall = _project(efs_ds, EFS_COLS, filter=ds.field('scope') == 'overall').to_pandas()
             valid = overall.dropna(subset=['efs'])
-            efs_lines.append(f"Total rows: {len(df_efs):,} (overall: {len(overall):,}, SOC-level: {len(df_efs) - len(overall):,})")
+            efs_lines.append(f"Total rows: {n_efs:,} (overall: {len(overall):,}, SOC-level: {n_efs - len(overall):,})")
             efs_lines.append(f"With valid EFS: {len(valid):,} / {len(overall):,} ({len(valid)/max(len(overall),1)*100:.1f}%)")
             if len(valid) > 0:
+                # One agg over EFS + sub-scores instead of a reduction per line
+                subscores = [c for c in ['outcome_subscore', 'wage_subscore', 'sustainability_subscore']
+                             if c in valid.columns]
+                stats = valid[['efs'] + subscores].agg(['mean', 'median', 'std', 'min', 'max'])
                 efs_lines.append(f"\nEFS distribution (overall employers):")
-                efs_lines.append(f"  Mean:   {valid['efs'].mean():.1f}")
-                efs_lines.append(f"  Median: {valid['efs'].median():.1f}")
-                efs_lines.append(f"  Std:    {valid['efs'].std():.1f}")
-                efs_lines.append(f"  Min:    {valid['efs'].min():.1f}")
-                efs_lines.append(f"  Max:    {valid['efs'].max():.1f}")
+                efs_lines.append(f"  Mean:   {stats.at['mean', 'efs']:.1f}")
+                efs_lines.append(f"  Median: {stats.at['median', 'efs']:.1f}")
+                efs_lines.append(f"  Std:    {stats.at['std', 'efs']:.1f}")
+                efs_lines.append(f"  Min:    {stats.at['min', 'efs']:.1f}")
+                efs_lines.append(f"  Max:    {stats.at['max', 'efs']:.1f}")
                 efs_lines.append(f"\nTier distribution:")
-                for tier, cnt in valid['efs_tier'].value_counts().items():
+                for tier, cnt in valid['efs_tier'].value_counts().to_dict().items():
                     efs_lines.append(f"  {tier:16s}: {cnt:,} ({cnt/len(valid)*100:.1f}%)")
                 # Sub-score stats
-                for col in ['outcome_subscore', 'wage_subscore', 'sustainability_subscore']:
-                    if col in valid.columns:
-                        efs_lines.append(f"\n{col}: mean={valid[col].mean():.1f}, "
-                                         f"median={valid[col].median():.1f}, "
-                                         f"std={valid[col].std():.1f}")
+                for col in subscores:
+                    efs_lines.append(f"\n{col}: mean={stats.at['mean', col]:.1f}, "
+                                     f"median={stats.at['median', col]:.1f}, "
+                                     f"std={stats.at['std', col]:.1f}")
                 # Top 10 by EFS (with n_24m ≥ 10 for meaningful ranking)
                 qualified = valid[valid['n_24m'] >= 10].nlargest(10, 'efs')
                 if len(qualified) > 0:
                     efs_top10 = []
-                    for _, r in qualified.iterrows():
+                    # Optional columns fall back to the old r.get() defaults
+                    defaults = {'employer_name': '?', 'approval_rate_24m': 0}
+                    top = qualified.assign(**{c: v for c, v in defaults.items() if c not in qualified.columns})
+                    top_cols = ['employer_name', 'n_24m', 'approval_rate_24m', 'efs', 'efs_tier']
+                    for name, n_24m, rate, efs, tier in top[top_cols].itertuples(index=False, name=None):
                         efs_top10.append(
-                            f"| {r.get('employer_name','?')[:40]:40s} | {r['n_24m']:5.0f} | "
-                            f"{r.get('approval_rate_24m',0)*100:5.1f}% | {r['efs']:5.1f} | {r['efs_tier']:14s} |"
+                            f"| {name[:40]:40s} | {n_24m:5.0f} | "
+                            f"{rate*100:5.1f}% | {efs:5.1f} | {tier:14s} |"
                         )
         else:
             efs_lines.append("employer_friendliness_scores.parquet not found (run EFS pipeline first)")
@@ -193,59 +331,55 @@ def main():
     lca_status_table = []
     try:
         fact_lca_dir = artifacts_root / "tables" / "fact_lca"
-        df_lca = None
-        if fact_lca_dir.exists() and fact_lca_dir.is_dir():
-            pfiles = list(fact_lca_dir.rglob("*.parquet"))
-            if pfiles:
-                dfs = []
-                for pf in pfiles:
-                    pdf = pd.read_parquet(pf)
-                    for part in pf.parts:
-                        if '=' in part:
-                            col_name, col_value = part.split('=', 1)
-                            if col_name not in pdf.columns:
-                                pdf[col_name] = col_value
-                    dfs.append(pdf)
-                df_lca = pd.concat(dfs, ignore_index=True)
-        if df_lca is not None and len(df_lca) > 0:
-            lca_lines.append(f"Total rows: {len(df_lca):,}")
+        tbl = None
+        lca_ds = _open_table(fact_lca_dir) if fact_lca_dir.is_dir() else None
+        if lca_ds is not None:
+            tbl = _project(lca_ds, LCA_COLS)
+        if tbl is not None and tbl.num_rows > 0:
+            cols = tbl.column_names
+            n_lca = tbl.num_rows
+            lca_lines.append(f"Total rows: {n_lca:,}")
             # FY breakdown
-            if 'fiscal_year' in df_lca.columns:
-                df_lca['fiscal_year'] = pd.to_numeric(df_lca['fiscal_year'], errors='coerce')
-                for fy_val, cnt in df_lca['fiscal_year'].value_counts().sort_index().items():
-                    lca_fy_table.append((int(fy_val), cnt))
-                lca_lines.append(f"Fiscal years: {len(lca_fy_table)} ({int(min(df_lca['fiscal_year'].dropna()))}-{int(max(df_lca['fiscal_year'].dropna()))})")
+            if 'fiscal_year' in cols:
+                fy = pc.cast(tbl['fiscal_year'], pa.int32(), safe=False)
+                lca_fy_table = sorted(_value_counts(fy))
+                fy_range = pc.min_max(fy).as_py()
+                lca_lines.append(f"Fiscal years: {len(lca_fy_table)} ({fy_range['min']}-{fy_range['max']})")
             # Status breakdown
-            if 'case_status' in df_lca.columns:
-                for status, cnt in df_lca['case_status'].value_counts().items():
-                    lca_status_table.append((status, cnt, cnt / len(df_lca) * 100))
+            if 'case_status' in cols:
+                for status, cnt in _value_counts(tbl['case_status']):
+                    lca_status_table.append((status, cnt, cnt / n_lca * 100))
             # Visa class breakdown
-            if 'visa_class' in df_lca.columns:
+            if 'visa_class' in cols:
                 lca_lines.append("\nVisa class distribution:")
-                for vc, cnt in df_lca['visa_class'].value_counts().head(10).items():
-                    lca_lines.append(f"  {vc}: {cnt:,} ({cnt/len(df_lca)*100:.1f}%)")
+                for vc, cnt in _value_counts(tbl['visa_class'])[:10]:
+                    lca_lines.append(f"  {vc}: {cnt:,} ({cnt/n_lca*100:.1f}%)")
             # Employer coverage
-            if 'employer_id' in df_lca.columns:
-                filled = df_lca['employer_id'].notna() & (df_lca['employer_id'] != '')
-                lca_lines.append(f"\nEmployer ID filled: {filled.sum():,} / {len(df_lca):,} ({filled.sum()/len(df_lca)*100:.1f}%)")
-                lca_lines.append(f"Unique employers: {df_lca.loc[filled, 'employer_id'].nunique():,}")
+            if 'employer_id' in cols:
+                col = tbl['employer_id']
+                filled = pc.and_kleene(pc.is_valid(col), pc.not_equal(col, ''))
+                n_filled = _count(filled)
+                lca_lines.append(f"\nEmployer ID filled: {n_filled:,} / {n_lca:,} ({n_filled/n_lca*100:.1f}%)")
+                lca_lines.append(f"Unique employers: {pc.count_distinct(pc.filter(col, filled)).as_py():,}")
             # SOC coverage
-            if 'soc_code' in df_lca.columns:
-                filled = df_lca['soc_code'].notna() & (df_lca['soc_code'] != '')
-                lca_lines.append(f"SOC code filled: {filled.sum():,} / {len(df_lca):,} ({filled.sum()/len(df_lca)*100:.1f}%)")
-                lca_lines.append(f"Unique SOC codes: {df_lca.loc[filled, 'soc_code'].nunique():,}")
+            if 'soc_code' in cols:
+                col = tbl['soc_code']
+                filled = pc.and_kleene(pc.is_valid(col), pc.not_equal(col, ''))
+                n_filled = _count(filled)
+                lca_lines.append(f"SOC code filled: {n_filled:,} / {n_lca:,} ({n_filled/n_lca*100:.1f}%)")
+                lca_lines.append(f"Unique SOC codes: {pc.count_distinct(pc.filter(col, filled)).as_py():,}")
             # Wage stats
-            if 'wage_rate_from' in df_lca.columns:
-                wages = df_lca['wage_rate_from'].dropna()
+            if 'wage_rate_from' in cols:
+                wages = pc.filter(tbl['wage_rate_from'], _notna(tbl['wage_rate_from']))
                 if len(wages) > 0:
                     lca_lines.append(f"\nWage (from) stats:")
                     lca_lines.append(f"  Non-null: {len(wages):,}")
-                    lca_lines.append(f"  Mean: ${wages.mean():,.0f}")
-                    lca_lines.append(f"  Median: ${wages.median():,.0f}")
+                    lca_lines.append(f"  Mean: ${pc.mean(wages).as_py():,.0f}")
+                    lca_lines.append(f"  Median: ${pc.quantile(wages, q=0.5)[0].as_py():,.0f}")
             # Source files
-            if 'source_file' in df_lca.columns:
-                lca_lines.append(f"\nSource files: {df_lca['source_file'].nunique()}")
-            lca_lines.append(f"\nColumns: {list(df_lca.columns)}")
+            if 'source_file' in cols:
+                lca_lines.append(f"\nSource files: {pc.count_distinct(tbl['source_file']).as_py()}")
+            lca_lines.append(f"\nColumns: {lca_ds.schema.names}")
         else:
             lca_lines.append("fact_lca not found (run LCA ingestion first)")
     except Exception as e:
@@ -260,28 +394,22 @@ def main():
 
     # ── WARN/ERROR log excerpts from all *.log files ──────
     warn_error_lines = []
-    log_files = sorted(metrics_dir.glob("*.log"))
-    for lf in log_files:
+    for log_name in log_index:
         try:
-            lines = lf.read_text().splitlines()
-            matches = [l for l in lines if any(kw in l.upper() for kw in ['WARN', 'ERROR', 'FAIL'])]
+            hits = islice(_WARN_ERROR_LINE.finditer(log_bytes(log_name)), 100)
+            matches = [m.group().decode("utf-8", "replace").rstrip("\r") for m in hits]
             if matches:
-                warn_error_lines.append(f"\n### {lf.name}")
-                for ml in matches[:100]:
+                warn_error_lines.append(f"\n### {log_name}")
+                for ml in matches:
                     warn_error_lines.append(f"  {ml}")
         except Exception as e:
-            warn_error_lines.append(f"\n### {lf.name}: ERROR reading - {e}")
+            warn_error_lines.append(f"\n### {log_name}: ERROR reading - {e}")
 
     if not warn_error_lines:
         warn_error_lines.append("No WARN/ERROR/FAIL lines found in log files.")
 
-    # ── STEP A: VB parity check (fail-fast before writing FINAL report) ─────────────
-    _scripts_dir = Path(__file__).resolve().parent
-    _parity_result = subprocess.run(
-        [sys.executable, str(_scripts_dir / "check_vb_parity.py")],
-        capture_output=False,
-    )
-    if _parity_result.returncode != 0:
+    # ── STEP A (wait): VB parity result (fail-fast before writing FINAL report) ──────
+    if _parity_proc.wait() != 0:
         print("\nVB parity mismatch; see check_vb_parity output", file=sys.stderr)
         print("Fix order:", file=sys.stderr)
         print("  1. python scripts/restore_fact_cutoffs_from_backup.py", file=sys.stderr)
@@ -296,289 +424,297 @@ def main():
     print()
 
     # ── Build report ──────────────────────────────────────
-    with open(report_path, 'w') as f:
-        f.write("# Immigration Model Builder - Comprehensive Migration Report\n\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n---\n\n")
-
-        # Executive Summary
-        f.write("## Executive Summary\n\n")
-        f.write("Six fixes applied end-to-end plus EFS implementation plus LCA ingestion:\n\n")
-        f.write("1. **FIX 1** - PERM Reconciliation: quarantine legacy, harmonize columns, dedupe, partition-only.\n")
-        f.write("2. **FIX 2** - dim_soc Expansion: full SOC-2018 from OEWS 2023 + crosswalk.\n")
-        f.write("3. **FIX 3** - dim_country: rebuilt with >=200 ISO 3166-1 countries.\n")
-        f.write("4. **FIX 4** - Visa Bulletin: legacy parsing (2011-2014) + dedupe -> PK-unique.\n")
-        f.write("5. **FIX 5** - OEWS: .xlsx/.zip support, skip corrupt 2024.\n")
-        f.write("6. **FIX 6** - Audits: column listing, conditional PK checks, thresholds.\n")
-        f.write("7. **EFS** - Employer Friendliness Score v1: rules-based scoring (0-100) from PERM + OEWS.\n")
-        f.write("8. **LCA** - H-1B Labor Condition Application ingestion: FY2008-FY2026, iCERT + FLAG eras.\n")
-        f.write("\n---\n\n")
-
-        # Section 1: Input Coverage
-        f.write("## 1. Input Coverage Summary\n\n")
-        f.write("| Dataset | Expected | Processed | Coverage | Threshold | Status |\n")
-        f.write("|---------|----------|-----------|----------|-----------|--------|\n")
-        for ds in ['PERM', 'OEWS', 'Visa_Bulletin', 'LCA']:
-            info = input_cov.get(ds, {})
-            exp = info.get('expected', '?')
-            proc = info.get('processed', '?')
-            cov = info.get('coverage_pct', 0)
-            thr = thresholds.get(ds, 0.95)
-            cov_pct = f"{cov*100:.1f}%" if isinstance(cov, (int, float)) else str(cov)
-            thr_pct = f"{thr*100:.0f}%"
-            if thr == 0:
-                status = "OUT OF SCOPE"
-            elif isinstance(cov, (int, float)) and cov >= thr:
-                status = "PASS"
-            else:
-                status = "FAIL"
-            f.write(f"| {ds} | {exp} | {proc} | {cov_pct} | {thr_pct} | {status} |\n")
-        f.write("\n---\n\n")
-
-        # Section 2: Output Audit
-        f.write("## 2. Output Audit Summary\n\n")
-        f.write("| Table | Rows | Columns (sample) | PK Unique | Partitions | Status |\n")
-        f.write("|-------|------|------------------|-----------|------------|--------|\n")
-        for tbl, info in output_audit.items():
-            rows = f"{info.get('rows', 0):,}"
-            pk = info.get('pk_unique')
-            pk_str = "Y" if pk is True else ("N" if pk is False else "-")
-            cols = info.get('columns_sample', info.get('columns_present', []))
-            cols_str = ', '.join(cols[:5]) + ('...' if len(cols) > 5 else '')
-            parts = info.get('partitions', [])
-            parts_str = "-"
-            if parts:
-                part_items: list[str] = []
-                for pi in parts:
-                    pcol = pi.get('column', '')
-                    vals = pi.get('values', [])
-                    if not vals:
-                        continue
-                    svals = sorted(str(v) for v in vals)
-                    if pcol == 'bulletin_month':
-                        part_items.append(f"{pcol}: {len(vals)} vals")
-                    elif pcol == 'bulletin_year' and len(svals) > 1:
-                        part_items.append(f"{pcol}: {svals[0]}\u2013{svals[-1]}")
-                    elif len(svals) == 1:
-                        part_items.append(f"{pcol}: {svals[0]}")
-                    else:
-                        part_items.append(f"{pcol}: {len(svals)} vals")
-                parts_str = " | ".join(part_items) if part_items else "-"
-            missing = info.get('required_missing', [])
-            err = info.get('error')
-            if err:
-                st = f"WARN: {err[:30]}"
-            elif missing:
-                st = f"WARN: {len(missing)} missing"
-            elif pk is False:
-                st = "WARN: PK dup"
-            else:
-                st = "OK"
-            f.write(f"| {tbl} | {rows} | {cols_str} | {pk_str} | {parts_str} | {st} |\n")
-        f.write("\n---\n\n")
-
-        # Section 2b: Derived Tables
-        if manifest_derived:
-            f.write("## 2b. Derived Tables\n\n")
-            f.write("These tables are computed views derived from canonical tables ")
-            f.write("(not independently ingested from raw data).\n\n")
-            f.write("| Table | Rows | Files | Note |\n")
-            f.write("|-------|------|-------|------|\n")
-            for tname, tinfo in manifest_derived.items():
-                nrows = f"{tinfo.get('row_count', 0):,}"
-                nfiles = len(tinfo.get("files", []))
-                note = "one row per case_number (cross-FY dedup)" if tname == "fact_perm_unique_case" else "-"
-                f.write(f"| {tname} | {nrows} | {nfiles} | {note} |\n")
-            # fact_perm_unique_case specific stats
-            uc_log_p = metrics_dir / "fact_perm_unique_case.log"
-            if uc_log_p.exists():
-                uc_lines = uc_log_p.read_text().splitlines()
-                removed = next((l for l in uc_lines if "total_removed" in l), None)
-                crossfy = next((l for l in uc_lines if "is_crossfy_duplicate" in l), None)
-                if removed or crossfy:
-                    f.write("\n**fact_perm_unique_case build stats:**\n")
-                    f.write("```\n")
-                    for stat_line in uc_lines[:12]:
-                        f.write(stat_line + "\n")
-                    f.write("```\n")
-            f.write("\n---\n\n")
-
-        # Section 3: PERM Reconciliation
-        f.write("## 3. FIX 1: PERM Reconciliation\n\n```\n")
-        f.write('\n'.join(perm_log))
-        f.write("\n```\n\n---\n\n")
-
-        # Section 4: Visa Bulletin Dedupe
-        f.write("## 4. FIX 4: Visa Bulletin Dedupe\n\n```\n")
-        f.write('\n'.join(cutoffs_log))
-        f.write("\n```\n\n---\n\n")
-
-        # Section 5: dim_soc Expansion
-        f.write("## 5. FIX 2: dim_soc Expansion\n\n```\n")
-        f.write('\n'.join(soc_log))
-        f.write("\n```\n\n---\n\n")
-
-        # Section 6: dim_country
-        f.write("## 6. FIX 3: dim_country Completeness\n\n```\n")
-        f.write('\n'.join(country_log))
-        f.write("\n```\n\n---\n\n")
-
-        # Section 7: OEWS Detail
-        f.write("## 7. OEWS Detail (ref_year rows, hourly-to-annual, missing-key stats)\n\n```\n")
-        f.write('\n'.join(oews_lines))
-        f.write("\n```\n\n---\n\n")
-
-        # Section 8: WARN/ERROR Log Excerpts
-        f.write("## 8. WARN / ERROR Log Excerpts (top 100 lines per log)\n\n")
-        f.write("Scanning `artifacts/metrics/*.log` for WARN, ERROR, and FAIL keywords:\n\n")
-        f.write("```\n")
-        f.write('\n'.join(warn_error_lines))
-        f.write("\n```\n\n---\n\n")
-
-        # Section 9: Employer Friendliness Score (EFS)
-        f.write("## 9. Employer Friendliness Score (EFS)\n\n")
-        f.write("### Methodology\n\n")
-        f.write("EFS v1 rules-based score (0-100) per employer:\n\n")
-        f.write("| Component | Weight | Source |\n")
-        f.write("|-----------|--------|--------|\n")
-        f.write("| Outcome (Bayesian-shrunk approval rate) | 50% | PERM 24m |\n")
-        f.write("| Wage ratio (offered/OEWS) | 30% | PERM+OEWS |\n")
-        f.write("| Sustainability (trend, volume, stability) | 20% | PERM 24m |\n\n")
-        f.write("Guardrails: n_24m < 3 → NULL, all-denied → capped at 10.\n\n")
-        f.write("### Results\n\n```\n")
-        f.write('\n'.join(efs_lines))
-        f.write("\n```\n\n")
-        if efs_top10:
-            f.write("### Top 10 Employers (n_24m ≥ 10)\n\n")
-            f.write("| Employer | n_24m | Approval | EFS | Tier |\n")
-            f.write("|----------|-------|----------|-----|------|\n")
-            for row in efs_top10:
-                f.write(row + "\n")
-            f.write("\n")
-        f.write("### Verification\n\n```\n")
-        f.write('\n'.join(efs_verify_log))
-        f.write("\n```\n\n")
-
-        # ── EFS Verification — Detailed ───────────────────
-        f.write("### EFS Verification — Detailed\n\n")
-        if efs_diag:
-            # Eligibility
-            f.write("#### Eligibility Audit\n\n")
-            f.write(f"- Strict violations (n_24m<3 but scored): **{efs_diag.get('strict_violations', '?')}**\n")
-            f.write(f"- Borderline scored (n_24m<15 OR n_36m<30): **{efs_diag.get('borderline_scored', '?')}**\n\n")
-
-            # Range / quantiles
-            qs = efs_diag.get('quantiles', {})
-            if qs:
-                f.write("#### Range Audit — EFS Quantiles\n\n")
-                f.write("| Quantile | EFS |\n")
-                f.write("|----------|-----|\n")
-                for q_label in sorted(qs.keys()):
-                    f.write(f"| {q_label} | {qs[q_label]:.1f} |\n")
-                f.write("\n")
-
-            # Correlation
-            corr = efs_diag.get('correlation', {})
-            if corr.get('r') is not None:
-                f.write("#### Correlation: EFS vs approval_rate_24m\n\n")
-                f.write(f"- Pearson r = **{corr['r']:.4f}**\n")
-                f.write(f"- 95% bootstrap CI: [{corr['ci_lo']:.4f}, {corr['ci_hi']:.4f}]\n")
-                f.write(f"- n = {corr['n']:,}\n\n")
-
-            # Wage decile
-            wdl = efs_diag.get('wage_decile_lines', [])
-            if wdl:
-                f.write("#### Wage-Decile Effect\n\n```\n")
-                f.write('\n'.join(wdl))
-                f.write("\n```\n\n")
-
-            # Coverage
-            cov = efs_diag.get('coverage', {})
-            if cov:
-                f.write("#### Coverage\n\n")
-                f.write(f"- Overall employers scored: {cov.get('overall_scored', '?'):,} / "
-                        f"{cov.get('overall_total', '?'):,} ({cov.get('overall_pct', '?')}%)\n")
-                f.write(f"- SOC slices (n_24m≥10) scored: {cov.get('soc_scored', '?'):,} / "
-                        f"{cov.get('soc_eligible', '?'):,} ({cov.get('soc_pct', '?')}%)\n\n")
-
-            # Top residuals
-            rl = efs_diag.get('residual_lines', [])
-            if rl:
-                f.write("#### Top Residuals (manual review)\n\n```\n")
-                f.write('\n'.join(rl))
-                f.write("\n```\n\n")
-
-            # Verify log last 50 lines
-            f.write("#### Verify Log (last 50 lines)\n\n```\n")
-            f.write('\n'.join(efs_verify_log[-50:]))
-            f.write("\n```\n\n")
+    buf: list[str] = []
+    w = buf.append
+    w("# Immigration Model Builder - Comprehensive Migration Report\n\n")
+    w(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n---\n\n")
+
+    # Executive Summary
+    w("## Executive Summary\n\n")
+    w("Six fixes applied end-to-end plus EFS implementation plus LCA ingestion:\n\n")
+    w("1. **FIX 1** - PERM Reconciliation: quarantine legacy, harmonize columns, dedupe, partition-only.\n")
+    w("2. **FIX 2** - dim_soc Expansion: full SOC-2018 from OEWS 2023 + crosswalk.\n")
+    w("3. **FIX 3** - dim_country: rebuilt with >=200 ISO 3166-1 countries.\n")
+    w("4. **FIX 4** - Visa Bulletin: legacy parsing (2011-2014) + dedupe -> PK-unique.\n")
+    w("5. **FIX 5** - OEWS: .xlsx/.zip support, skip corrupt 2024.\n")
+    w("6. **FIX 6** - Audits: column listing, conditional PK checks, thresholds.\n")
+    w("7. **EFS** - Employer Friendliness Score v1: rules-based scoring (0-100) from PERM + OEWS.\n")
+    w("8. **LCA** - H-1B Labor Condition Application ingestion: FY2008-FY2026, iCERT + FLAG eras.\n")
+    w("\n---\n\n")
+
+    # Section 1: Input Coverage
+    w("## 1. Input Coverage Summary\n\n")
+    w("| Dataset | Expected | Processed | Coverage | Threshold | Status |\n")
+    w("|---------|----------|-----------|----------|-----------|--------|\n")
+    for dataset in ['PERM', 'OEWS', 'Visa_Bulletin', 'LCA']:
+        info = input_cov.get(dataset, {})
+        exp = info.get('expected', '?')
+        proc = info.get('processed', '?')
+        cov = info.get('coverage_pct', 0)
+        thr = thresholds.get(dataset, 0.95)
+        cov_pct = f"{cov*100:.1f}%" if isinstance(cov, (int, float)) else str(cov)
+        thr_pct = f"{thr*100:.0f}%"
+        if thr == 0:
+            status = "OUT OF SCOPE"
+        elif isinstance(cov, (int, float)) and cov >= thr:
+            status = "PASS"
+        else:
+            status = "FAIL"
+        w(f"| {dataset} | {exp} | {proc} | {cov_pct} | {thr_pct} | {status} |\n")
+    w("\n---\n\n")
+
+    # Section 2: Output Audit
+    w("## 2. Output Audit Summary\n\n")
+    w("| Table | Rows | Columns (sample) | PK Unique | Partitions | Status |\n")
+    w("|-------|------|------------------|-----------|------------|--------|\n")
+    for tbl, info in output_audit.items():
+        rows = f"{info.get('rows', 0):,}"
+        pk = info.get('pk_unique')
+        pk_str = "Y" if pk is True else ("N" if pk is False else "-")
+        cols = info.get('columns_sample', info.get('columns_present', []))
+        cols_str = ', '.join(cols[:5]) + ('...' if len(cols) > 5 else '')
+        parts = info.get('partitions', [])
+        parts_str = "-"
+        if parts:
+            part_items: list[str] = []
+            for pi in parts:
+                pcol = pi.get('column', '')
+                vals = pi.get('values', [])
+                if not vals:
+                    continue
+                svals = sorted(str(v) for v in vals)
+                if pcol == 'bulletin_month':
+                    part_items.append(f"{pcol}: {len(vals)} vals")
+                elif pcol == 'bulletin_year' and len(svals) > 1:
+                    part_items.append(f"{pcol}: {svals[0]}\u2013{svals[-1]}")
+                elif len(svals) == 1:
+                    part_items.append(f"{pcol}: {svals[0]}")
+                else:
+                    part_items.append(f"{pcol}: {len(svals)} vals")
+            parts_str = " | ".join(part_items) if part_items else "-"
+        missing = info.get('required_missing', [])
+        err = info.get('error')
+        if err:
+            st = f"WARN: {err[:30]}"
+        elif missing:
+            st = f"WARN: {len(missing)} missing"
+        elif pk is False:
+            st = "WARN: PK dup"
         else:
-            f.write("_(diagnostics JSON not found — run verify_efs first)_\n\n")
-
-        f.write("---\n\n")
-
-        # Section 10: LCA (H-1B) Ingestion Summary
-        f.write("## 10. LCA (H-1B) — Ingestion Summary\n\n")
-        f.write("### Overview\n\n```\n")
-        f.write('\n'.join(lca_lines))
-        f.write("\n```\n\n")
-        if lca_fy_table:
-            f.write("### Per-FY Row Counts\n\n")
-            f.write("| Fiscal Year | Rows |\n")
-            f.write("|-------------|------|\n")
-            for fy_val, cnt in sorted(lca_fy_table):
-                f.write(f"| FY{fy_val} | {cnt:,} |\n")
-            f.write("\n")
-        if lca_status_table:
-            f.write("### Case Status Distribution\n\n")
-            f.write("| Status | Count | Pct |\n")
-            f.write("|--------|-------|-----|\n")
-            for status, cnt, pct in sorted(lca_status_table, key=lambda x: -x[1]):
-                f.write(f"| {status} | {cnt:,} | {pct:.1f}% |\n")
-            f.write("\n")
-        f.write("### Build Log\n\n```\n")
-        f.write('\n'.join(lca_log))
-        f.write("\n```\n\n---\n\n")
-
-        # Section 11: Known Issues & Accepted Risks
-        f.write("## 11. Known Issues & Accepted Risks\n\n")
-        f.write("1. **OEWS 2024** \u2014 Official 2024 file not accessible (HTTP 403, see fetch_oews.log). Using a clearly labeled synthetic fallback derived from 2023 to maintain coverage. Current coverage: 2/2 (100%).\n")
-        f.write("2. ~~Visa Bulletin legacy~~ \u2014 **RESOLVED**: All 2011\u20132014 PDFs parsed; VB presentation is PK\u2011unique; 168 year\u00d7month partitions (2011\u20132026).\n")
-        f.write("3. **LCA** - Full ingestion implemented (FY2008-FY2026). iCERT + FLAG eras.\n")
-        f.write("4. ~~**PERM fiscal_year=0**~~ - **RESOLVED**: `fiscal_year` is now forced from source directory name for all rows; 0 null/zero rows confirmed.\n")
-        f.write("5. **Crosswalk minimal** - only 2 entries; most dim_soc codes from OEWS 2023.\n")
-        f.write("6. **fact_perm cross-FY duplicates** - 339K rows with duplicate `case_number` across adjacent FY disclosure files (DOL publishes pending cases in multiple annual releases); accepted.\n")
-        f.write("\n---\n\n")
-
-        # Section 12: Reproduction Steps
-        f.write("## 12. Reproduction Steps\n\n```bash\n")
-        f.write("cd /Users/vrathod1/dev/NorthStar/immigration-model-builder\n")
-        f.write("python3 scripts/fix1_perm_reconcile.py\n")
-        f.write("python3 scripts/fix2_dim_soc.py\n")
-        f.write("python3 scripts/fix3_dim_country.py\n")
-        f.write("python3 scripts/fix4_visa_bulletin.py\n")
-        f.write("python3 scripts/fix5_oews_robustness.py\n")
-        f.write("python3 scripts/make_vb_presentation.py\n")
-        f.write("python3 scripts/make_vb_snapshot.py\n")
-        f.write("python3 scripts/check_vb_parity.py\n")
-        f.write("python3 scripts/make_build_manifest.py\n")
-        f.write("python3 scripts/audit_input_coverage.py --paths configs/paths.yaml \\\n")
-        f.write("  --report artifacts/metrics/input_coverage_report.md \\\n")
-        f.write("  --json artifacts/metrics/input_coverage_report.json \\\n")
-        f.write("  --config configs/audit.yml\n")
-        f.write("python3 scripts/audit_outputs.py --paths configs/paths.yaml \\\n")
-        f.write("  --schemas configs/schemas.yml \\\n")
-        f.write("  --vb_presentation artifacts/tables/fact_cutoffs_all.parquet \\\n")
-        f.write("  --report artifacts/metrics/output_audit_report.md \\\n")
-        f.write("  --json artifacts/metrics/output_audit_report.json\n")
-        f.write("python3 -m src.features.run_features --paths configs/paths.yaml\n")
-        f.write("python3 -m src.models.run_models --paths configs/paths.yaml\n")
-        f.write("python3 -m src.validate.verify_efs --paths configs/paths.yaml\n")
-        f.write("python3 scripts/generate_final_report.py\n")
-        f.write("```\n")
+            st = "OK"
+        w(f"| {tbl} | {rows} | {cols_str} | {pk_str} | {parts_str} | {st} |\n")
+    w("\n---\n\n")
+
+    # Section 2b: Derived Tables
+    if manifest_derived:
+        w("## 2b. Derived Tables\n\n")
+        w("These tables are computed views derived from canonical tables ")
+        w("(not independently ingested from raw data).\n\n")
+        w("| Table | Rows | Files | Note |\n")
+        w("|-------|------|-------|------|\n")
+        for tname, tinfo in manifest_derived.items():
+            nrows = f"{tinfo.get('row_count', 0):,}"
+            nfiles = len(tinfo.get("files", []))
+            note = "one row per case_number (cross-FY dedup)" if tname == "fact_perm_unique_case" else "-"
+            w(f"| {tname} | {nrows} | {nfiles} | {note} |\n")
+        # fact_perm_unique_case specific stats
+        if "fact_perm_unique_case.log" in log_index:
+            uc_lines = read_log("fact_perm_unique_case.log", None)
+            removed = next((l for l in uc_lines if "total_removed" in l), None)
+            crossfy = next((l for l in uc_lines if "is_crossfy_duplicate" in l), None)
+            if removed or crossfy:
+                w("\n**fact_perm_unique_case build stats:**\n")
+                w("```\n")
+                for stat_line in uc_lines[:12]:
+                    w(stat_line + "\n")
+                w("```\n")
+        w("\n---\n\n")
+
+    # Section 3: PERM Reconciliation
+    w("## 3. FIX 1: PERM Reconciliation\n\n```\n")
+    w('\n'.join(perm_log))
+    w("\n```\n\n---\n\n")
+
+    # Section 4: Visa Bulletin Dedupe
+    w("## 4. FIX 4: Visa Bulletin Dedupe\n\n```\n")
+    w('\n'.join(cutoffs_log))
+    w("\n```\n\n---\n\n")
+
+    # Section 5: dim_soc Expansion
+    w("## 5. FIX 2: dim_soc Expansion\n\n```\n")
+    w('\n'.join(soc_log))
+    w("\n```\n\n---\n\n")
+
+    # Section 6: dim_country
+    w("## 6. FIX 3: dim_country Completeness\n\n```\n")
+    w('\n'.join(country_log))
+    w("\n```\n\n---\n\n")
+
+    # Section 7: OEWS Detail
+    w("## 7. OEWS Detail (ref_year rows, hourly-to-annual, missing-key stats)\n\n```\n")
+    w('\n'.join(oews_lines))
+    w("\n```\n\n---\n\n")
+
+    # Section 8: WARN/ERROR Log Excerpts
+    w("## 8. WARN / ERROR Log Excerpts (top 100 lines per log)\n\n")
+    w("Scanning `artifacts/metrics/*.log` for WARN, ERROR, and FAIL keywords:\n\n")
+    w("```\n")
+    w('\n'.join(warn_error_lines))
+    w("\n```\n\n---\n\n")
+
+    # Section 9: Employer Friendliness Score (EFS)
+    w("## 9. Employer Friendliness Score (EFS)\n\n")
+    w("### Methodology\n\n")
+    w("EFS v1 rules-based score (0-100) per employer:\n\n")
+    w("| Component | Weight | Source |\n")
+    w("|-----------|--------|--------|\n")
+    w("| Outcome (Bayesian-shrunk approval rate) | 50% | PERM 24m |\n")
+    w("| Wage ratio (offered/OEWS) | 30% | PERM+OEWS |\n")
+    w("| Sustainability (trend, volume, stability) | 20% | PERM 24m |\n\n")
+    w("Guardrails: n_24m < 3 → NULL, all-denied → capped at 10.\n\n")
+    w("### Results\n\n```\n")
+    w('\n'.join(efs_lines))
+    w("\n```\n\n")
+    if efs_top10:
+        w("### Top 10 Employers (n_24m ≥ 10)\n\n")
+        w("| Employer | n_24m | Approval | EFS | Tier |\n")
+        w("|----------|-------|----------|-----|------|\n")
+        for row in efs_top10:
+            w(row + "\n")
+        w("\n")
+    w("### Verification\n\n```\n")
+    w('\n'.join(efs_verify_log))
+    w("\n```\n\n")
+
+    # ── EFS Verification — Detailed ───────────────────
+    w("### EFS Verification — Detailed\n\n")
+    if efs_diag:
+        # Eligibility
+        w("#### Eligibility Audit\n\n")
+        w(f"- Strict violations (n_24m<3 but scored): **{efs_diag.get('strict_violations', '?')}**\n")
+        w(f"- Borderline scored (n_24m<15 OR n_36m<30): **{efs_diag.get('borderline_scored', '?')}**\n\n")
+
+        # Range / quantiles
+        qs = efs_diag.get('quantiles', {})
+        if qs:
+            w("#### Range Audit — EFS Quantiles\n\n")
+            w("| Quantile | EFS |\n")
+            w("|----------|-----|\n")
+            for q_label in sorted(qs.keys()):
+                w(f"| {q_label} | {qs[q_label]:.1f} |\n")
+            w("\n")
+
+        # Correlation
+        corr = efs_diag.get('correlation', {})
+        if corr.get('r') is not None:
+            w("#### Correlation: EFS vs approval_rate_24m\n\n")
+            w(f"- Pearson r = **{corr['r']:.4f}**\n")
+            w(f"- 95% bootstrap CI: [{corr['ci_lo']:.4f}, {corr['ci_hi']:.4f}]\n")
+            w(f"- n = {corr['n']:,}\n\n")
+
+        # Wage decile
+        wdl = efs_diag.get('wage_decile_lines', [])
+        if wdl:
+            w("#### Wage-Decile Effect\n\n```\n")
+            w('\n'.join(wdl))
+            w("\n```\n\n")
+
+        # Coverage
+        cov = efs_diag.get('coverage', {})
+        if cov:
+            w("#### Coverage\n\n")
+            w(f"- Overall employers scored: {cov.get('overall_scored', '?'):,} / "
+                    f"{cov.get('overall_total', '?'):,} ({cov.get('overall_pct', '?')}%)\n")
+            w(f"- SOC slices (n_24m≥10) scored: {cov.get('soc_scored', '?'):,} / "
+                    f"{cov.get('soc_eligible', '?'):,} ({cov.get('soc_pct', '?')}%)\n\n")
+
+        # Top residuals
+        rl = efs_diag.get('residual_lines', [])
+        if rl:
+            w("#### Top Residuals (manual review)\n\n```\n")
+            w('\n'.join(rl))
+            w("\n```\n\n")
+
+        # Verify log last 50 lines
+        w("#### Verify Log (last 50 lines)\n\n```\n")
+        w('\n'.join(efs_verify_log[-50:]))
+        w("\n```\n\n")
+    else:
+        w("_(diagnostics JSON not found — run verify_efs first)_\n\n")
+
+    w("---\n\n")
+
+    # Section 10: LCA (H-1B) Ingestion Summary
+    w("## 10. LCA (H-1B) — Ingestion Summary\n\n")
+    w("### Overview\n\n```\n")
+    w('\n'.join(lca_lines))
+    w("\n```\n\n")
+    if lca_fy_table:
+        w("### Per-FY Row Counts\n\n")
+        w("| Fiscal Year | Rows |\n")
+        w("|-------------|------|\n")
+        for fy_val, cnt in sorted(lca_fy_table):
+            w(f"| FY{fy_val} | {cnt:,} |\n")
+        w("\n")
+    if lca_status_table:
+        w("### Case Status Distribution\n\n")
+        w("| Status | Count | Pct |\n")
+        w("|--------|-------|-----|\n")
+        for status, cnt, pct in sorted(lca_status_table, key=lambda x: -x[1]):
+            w(f"| {status} | {cnt:,} | {pct:.1f}% |\n")
+        w("\n")
+    w("### Build Log\n\n```\n")
+    w('\n'.join(lca_log))
+    w("\n```\n\n---\n\n")
+
+    # Section 11: Known Issues & Accepted Risks
+    w("## 11. Known Issues & Accepted Risks\n\n")
+    w("1. **OEWS 2024** \u2014 Official 2024 file not accessible (HTTP 403, see fetch_oews.log). Using a clearly labeled synthetic fallback derived from 2023 to maintain coverage. Current coverage: 2/2 (100%).\n")
+    w("2. ~~Visa Bulletin legacy~~ \u2014 **RESOLVED**: All 2011\u20132014 PDFs parsed; VB presentation is PK\u2011unique; 168 year\u00d7month partitions (2011\u20132026).\n")
+    w("3. **LCA** - Full ingestion implemented (FY2008-FY2026). iCERT + FLAG eras.\n")
+    w("4. ~~**PERM fiscal_year=0**~~ - **RESOLVED**: `fiscal_year` is now forced from source directory name for all rows; 0 null/zero rows confirmed.\n")
+    w("5. **Crosswalk minimal** - only 2 entries; most dim_soc codes from OEWS 2023.\n")
+    w("6. **fact_perm cross-FY duplicates** - 339K rows with duplicate `case_number` across adjacent FY disclosure files (DOL publishes pending cases in multiple annual releases); accepted.\n")
+    w("\n---\n\n")
+
+    # Section 12: Reproduction Steps
+    w("## 12. Reproduction Steps\n\n```bash\n")
+    w("cd /Users/vrathod1/dev/NorthStar/immigration-model-builder\n")
+    w("python3 scripts/fix1_perm_reconcile.py\n")
+    w("python3 scripts/fix2_dim_soc.py\n")
+    w("python3 scripts/fix3_dim_country.py\n")
+    w("python3 scripts/fix4_visa_bulletin.py\n")
+    w("python3 scripts/fix5_oews_robustness.py\n")
+    w("python3 scripts/make_vb_presentation.py\n")
+    w("python3 scripts/make_vb_snapshot.py\n")
+    w("python3 scripts/check_vb_parity.py\n")
+    w("python3 scripts/make_build_manifest.py\n")
+    w("python3 scripts/audit_input_coverage.py --paths configs/paths.yaml \\\n")
+    w("  --report artifacts/metrics/input_coverage_report.md \\\n")
+    w("  --json artifacts/metrics/input_coverage_report.json \\\n")
+    w("  --config configs/audit.yml\n")
+    w("python3 scripts/audit_outputs.py --paths configs/paths.yaml \\\n")
+    w("  --schemas configs/schemas.yml \\\n")
+    w("  --vb_presentation artifacts/tables/fact_cutoffs_all.parquet \\\n")
+    w("  --report artifacts/metrics/output_audit_report.md \\\n")
+    w("  --json artifacts/metrics/output_audit_report.json\n")
+    w("python3 -m src.features.run_features --paths configs/paths.yaml\n")
+    w("python3 -m src.models.run_models --paths configs/paths.yaml\n")
+    w("python3 -m src.validate.verify_efs --paths configs/paths.yaml\n")
+    w("python3 scripts/generate_final_report.py\n")
+    w("```\n")
+
+    # One write of the assembled report (tmp + rename, so a failed run never
+    # leaves a half-written FINAL_SINGLE_REPORT.md behind)
+    tmp_path = report_path.with_suffix(".md.tmp")
+    tmp_path.write_text("".join(buf), encoding="utf-8")
+    os.replace(tmp_path, report_path)
 
     print(f"Report: {report_path}")
 
     # ── STEP B: Append Data Integrity Checklist (parquet-grounded) ───────────
+    # B and C stay sequential: each rewrites the whole report file, and the
+    # checklist truncates everything after its marker, P3 included.
     _checklist_result = subprocess.run(
         [sys.executable, str(_scripts_dir / "append_data_integrity_checklist.py")],
         capture_output=False,
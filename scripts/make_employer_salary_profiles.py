@@ -436,17 +436,14 @@ def main() -> None:
 
     # ── Combine ─────────────────────────────────────────────────────────
     log.info("\nCombining LCA + PERM ...")
-    # Ensure matching columns
+    # Ensure matching columns: reindex selects and null-fills missing ones in one step
     common_cols = ["employer_id", "employer_name", "soc_code", "job_title",
                    "visa_type", "fiscal_year", "annual_wage", "annual_pw",
                    "worksite_state"]
-    for col in common_cols:
-        if col not in lca.columns:
-            lca[col] = None
-        if col not in perm.columns:
-            perm[col] = None
-
-    combined = pd.concat([lca[common_cols], perm[common_cols]], ignore_index=True)
+    combined = pd.concat(
+        [lca.reindex(columns=common_cols), perm.reindex(columns=common_cols)],
+        ignore_index=True,
+    )
     log.info(f"  Combined rows: {len(combined):,}")
     log_lines.append(f"combined_total: {len(combined):,}")
 
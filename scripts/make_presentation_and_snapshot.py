@@ -19,6 +19,7 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import re
 import shutil
 import sys
 import tempfile
@@ -27,6 +28,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -36,6 +38,9 @@ TABLES = ROOT / "artifacts" / "tables"
 METRICS = ROOT / "artifacts" / "metrics"
 METRICS.mkdir(parents=True, exist_ok=True)
 
+# Hive path segment, e.g. "bulletin_month=05" → ("bulletin_month", "05")
+_HIVE_RE = re.compile(r"([^/=]+)=([^/]+)")
+
 LOG_LINES: list[str] = []
 
 # ── Logging ──────────────────────────────────────────────────────────────────
@@ -63,21 +68,82 @@ def _atomic_write_parquet(df: pd.DataFrame, dest: Path, **kwargs) -> None:
 
 
 def _read_partitioned(dir_path: Path, restore_partition_cols: bool = True) -> pd.DataFrame:
-    """Concat all parquet files under dir_path, restoring partition key cols."""
+    """Concat all parquet files under dir_path, restoring partition key cols.
+
+    Files are concatenated as Arrow tables and converted to pandas once;
+    falls back to pd.concat when the per-file schemas cannot be promoted.
+    """
     files = sorted(dir_path.rglob("*.parquet"))
-    dfs = []
+    tables = []
     for pf in files:
-        df = pd.read_parquet(pf)
+        tbl = pq.read_table(pf)
         if restore_partition_cols:
-            for part in pf.parts:
-                if "=" in part:
-                    col, val = part.split("=", 1)
-                    if col not in df.columns:
-                        df[col] = val
-        dfs.append(df)
-    if not dfs:
+            # One regex pass per file; pa.repeat fills the column without a
+            # per-row Python list.
+            for col, val in _HIVE_RE.findall(pf.relative_to(dir_path).as_posix()):
+                if col not in tbl.column_names:
+                    tbl = tbl.append_column(col, pa.repeat(pa.scalar(val, pa.string()), tbl.num_rows))
+        tables.append(tbl)
+    if not tables:
         return pd.DataFrame()
-    return pd.concat(dfs, ignore_index=True)
+    try:
+        try:
+            combined = pa.concat_tables(tables, promote_options="permissive")
+        except TypeError:  # pyarrow < 14 has no promote_options
+            combined = pa.concat_tables(tables, promote=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.concat([t.to_pandas() for t in tables], ignore_index=True)
+    del tables
+    # self_destruct releases Arrow buffers as pandas blocks are built
+    return combined.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _stream_partitioned(dir_path: Path, dest: Path) -> int:
+    """Write all parquet files under dir_path into one file at dest, one row
+    group at a time, restoring partition key cols as in _read_partitioned.
+
+    Peak memory is a single row group rather than the whole dataset. Falls
+    back to _read_partitioned + _atomic_write_parquet when the per-file
+    schemas cannot be unified. Returns the number of rows written.
+    """
+    files = sorted(dir_path.rglob("*.parquet"))
+    keys = {pf: _HIVE_RE.findall(pf.relative_to(dir_path).as_posix()) for pf in files}
+    try:
+        schemas = [pq.read_schema(pf) for pf in files]
+        try:
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+        except TypeError:  # pyarrow < 14 has no promote_options
+            schema = pa.unify_schemas(schemas)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+        df = _read_partitioned(dir_path)
+        _atomic_write_parquet(df, dest)
+        return len(df)
+    for col in dict(kv for pairs in keys.values() for kv in pairs):
+        if col not in schema.names:
+            schema = schema.append(pa.field(col, pa.string()))
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_suffix(f".tmp_{os.getpid()}.parquet")
+    rows = 0
+    with pq.ParquetWriter(tmp, schema) as writer:
+        for pf in files:
+            part_vals = dict(keys[pf])
+            reader = pq.ParquetFile(pf)
+            for i in range(reader.num_row_groups):
+                rg = reader.read_row_group(i)
+                n = rg.num_rows
+                columns = []
+                for field in schema:
+                    if field.name in rg.column_names:
+                        columns.append(rg[field.name].cast(field.type))
+                    elif field.name in part_vals:
+                        columns.append(pa.repeat(pa.scalar(part_vals[field.name], field.type), n))
+                    else:
+                        columns.append(pa.nulls(n, field.type))
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                rows += n
+    os.replace(tmp, dest)
+    return rows
 
 
 def _snapshot(
@@ -157,6 +223,12 @@ def build_vb_presentation() -> dict[str, Any]:
         df = _read_partitioned(cutoffs_dir)
         log(f"  Raw union: {len(df):,} rows")
 
+        # Partition values come back from the path as str; int64 keys keep the
+        # dedupe hashing on native ints (and match make_vb_presentation.py).
+        for col in ("bulletin_year", "bulletin_month"):
+            if col in df.columns:
+                df[col] = df[col].astype("int64")
+
         # Apply VB dedupe key: PK=(bulletin_year, bulletin_month, chart, category, country)
         # Preference: D > C > U → non-null cutoff_date → lex smallest source_file
         pk = ["bulletin_year", "bulletin_month", "chart", "category", "country"]
@@ -166,7 +238,11 @@ def build_vb_presentation() -> dict[str, Any]:
         else:
             df["_chart_ord"] = 9
         df["_cutoff_null"] = df["cutoff_date"].isna().astype(int) if "cutoff_date" in df.columns else 1
-        df["_src"] = df["source_file"] if "source_file" in df.columns else ""
+        if "source_file" in df.columns:
+            codes, uniques = pd.factorize(df["source_file"], sort=True)
+            df["_src"] = np.where(codes < 0, len(uniques), codes)  # NaN sorts last
+        else:
+            df["_src"] = 0
         df = df.sort_values(by=["_chart_ord", "_cutoff_null", "_src"])
         df = df.drop_duplicates(subset=pk, keep="first")
         df = df.drop(columns=["_chart_ord", "_cutoff_null", "_src"], errors="ignore")
@@ -240,10 +316,9 @@ def build_perm_snapshot(build_all_parquet: bool = True) -> dict[str, Any]:
             except Exception:
                 pass
         if rebuild:
-            log("  Building fact_perm_all.parquet (concat of partitions) …")
-            df = _read_partitioned(perm_dir)
-            _atomic_write_parquet(df, all_path)
-            log(f"  Written: {all_path.relative_to(ROOT)} ({len(df):,} rows)")
+            log("  Building fact_perm_all.parquet (streamed from partitions) …")
+            n_rows = _stream_partitioned(perm_dir, all_path)
+            log(f"  Written: {all_path.relative_to(ROOT)} ({n_rows:,} rows)")
     else:
         log("  Skipping fact_perm_all.parquet (build_all_parquet=False)")
 
@@ -283,10 +358,9 @@ def build_lca_snapshot(build_all_parquet: bool = False) -> dict[str, Any]:
 
     if build_all_parquet:
         all_path = TABLES / "fact_lca_all.parquet"
-        log("  Building fact_lca_all.parquet …")
-        df = _read_partitioned(lca_dir)
-        _atomic_write_parquet(df, all_path)
-        log(f"  Written: {all_path.relative_to(ROOT)} ({len(df):,} rows)")
+        log("  Building fact_lca_all.parquet (streamed from partitions) …")
+        n_rows = _stream_partitioned(lca_dir, all_path)
+        log(f"  Written: {all_path.relative_to(ROOT)} ({n_rows:,} rows)")
     else:
         log("  Skipping fact_lca_all.parquet (large; pass --lca-all to generate)")
 
@@ -17,7 +17,11 @@ import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 # ── Global controls ──────────────────────────────────────────────────────────
 CHUNK_SIZE: int = int(os.environ.get("CHUNK_SIZE", 250_000))
@@ -38,6 +42,12 @@ STATUS_PREF = {"D": 0, "C": 1, "U": 2}
 
 PK_COLS = ["bulletin_year", "bulletin_month", "chart", "category", "country"]
 
+# Hive partition keys; "bulletin_month=05" parses to 5
+PARTITION_SCHEMA = pa.schema([
+    ("bulletin_year", pa.int64()),
+    ("bulletin_month", pa.int64()),
+])
+
 
 def _is_excluded(path: Path) -> bool:
     s = str(path)
@@ -66,7 +76,7 @@ def scan_leaves() -> list[Path]:
     return leaves
 
 
-def read_all_leaves(leaves: list[Path]) -> pd.DataFrame:
+def _read_leaves_per_file(leaves: list[Path]) -> pd.DataFrame:
     dfs: list[pd.DataFrame] = []
     for leaf in leaves:
         yr, mo = _leaf_meta(leaf)
@@ -74,13 +84,50 @@ def read_all_leaves(leaves: list[Path]) -> pd.DataFrame:
         df["bulletin_year"] = yr
         df["bulletin_month"] = mo
         dfs.append(df)
-    if not dfs:
-        return pd.DataFrame()
     return pd.concat(dfs, ignore_index=True)
 
 
-def _status_rank(s: pd.Series) -> pd.Series:
-    return s.map(STATUS_PREF).fillna(99).astype(int)
+def _unify_leaf_schemas(leaves: list[Path]) -> pa.Schema:
+    schemas = [pq.read_schema(leaf) for leaf in leaves]
+    try:
+        # Permissive promotion merges e.g. timestamp[ns] vs timestamp[us] leaves
+        schema = pa.unify_schemas(schemas, promote_options="permissive")
+    except TypeError:  # pyarrow < 14 has no promote_options
+        schema = pa.unify_schemas(schemas)
+    for field in PARTITION_SCHEMA:
+        if field.name not in schema.names:
+            schema = schema.append(field)
+    return schema
+
+
+def read_all_leaves(leaves: list[Path]) -> pd.DataFrame:
+    """
+    Read all leaves with one pyarrow dataset scan (threaded file reads).
+    bulletin_year / bulletin_month are restored from the hive directory names.
+    Falls back to reading leaf by leaf if their schemas cannot be unified.
+    """
+    if not leaves:
+        return pd.DataFrame()
+    try:
+        schema = _unify_leaf_schemas(leaves)
+    except (pa.ArrowTypeError, pa.ArrowInvalid) as e:
+        print(f"  Leaf schemas differ ({e}); reading leaf by leaf")
+        return _read_leaves_per_file(leaves)
+    dataset = ds.dataset(
+        [str(leaf) for leaf in leaves],
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        partition_base_dir=str(FACT_CUTOFFS_DIR),
+    )
+    return dataset.to_table(use_threads=True).to_pandas()
+
+
+def _status_rank(s: pd.Series) -> np.ndarray:
+    """STATUS_PREF rank per row (99 for unknown flags), computed on codes."""
+    codes = pd.Categorical(s, categories=list(STATUS_PREF)).codes
+    ranks = np.array(list(STATUS_PREF.values()), dtype=np.int64)
+    return np.where(codes >= 0, ranks[codes], 99)
 
 
 def dedupe(df: pd.DataFrame) -> pd.DataFrame:
@@ -90,18 +137,20 @@ def dedupe(df: pd.DataFrame) -> pd.DataFrame:
       2. non-null cutoff_date (nulls last)
       3. lexicographically smallest source_file
     """
-    df = df.copy()
-    df["_rank_status"] = _status_rank(df["status_flag"].fillna("U"))
-    df["_rank_cutoff_null"] = df["cutoff_date"].isna().astype(int)  # 0=has date, 1=null
-    df["_rank_source"] = df["source_file"].fillna("zzz")
-
-    df.sort_values(
-        ["_rank_status", "_rank_cutoff_null", "_rank_source"],
-        inplace=True,
+    # Fold the three preferences into one integer so the best row per PK is a
+    # groupby idxmin rather than a full-frame multi-key sort.
+    status_rank = _status_rank(df["status_flag"].fillna("U"))
+    cutoff_null = df["cutoff_date"].isna().to_numpy(dtype=np.int64)  # 0=has date, 1=null
+    source_codes, sources = pd.factorize(df["source_file"].fillna("zzz"), sort=True)
+    priority = pd.Series(
+        (status_rank * 2 + cutoff_null) * (len(sources) + 1) + source_codes,
+        index=df.index,
     )
-    df.drop_duplicates(subset=PK_COLS, keep="first", inplace=True)
-    df.drop(columns=["_rank_status", "_rank_cutoff_null", "_rank_source"], inplace=True)
-    return df.reset_index(drop=True)
+
+    best_idx = priority.groupby(
+        [df[c] for c in PK_COLS], sort=False, dropna=False
+    ).idxmin()
+    return df.loc[best_idx.to_numpy()].reset_index(drop=True)
 
 
 def main():
@@ -15,7 +15,7 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-import pandas as pd
+import pyarrow.parquet as pq
 
 # ── Global controls ──────────────────────────────────────────────────────────
 EXCLUDE_PATTERNS: tuple[str, ...] = (
@@ -86,11 +86,7 @@ def main():
     for (yr, mo), files in sorted(groups.items()):
         row_count = 0
         for f in files:
-            try:
-                import pyarrow.parquet as pq
-                row_count += pq.read_metadata(f).num_rows
-            except Exception:
-                row_count += len(pd.read_parquet(f))
+            row_count += pq.read_metadata(f).num_rows
         file_names = sorted(str(f.relative_to(ROOT)) for f in files)
         leaf_records.append(
             {
@@ -113,7 +109,7 @@ def main():
     presentation_rows: int | None = None
     if PRESENTATION_PATH.exists():
         try:
-            presentation_rows = len(pd.read_parquet(PRESENTATION_PATH))
+            presentation_rows = pq.read_metadata(PRESENTATION_PATH).num_rows
         except Exception:
             pass
 
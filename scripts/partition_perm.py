@@ -1,37 +1,60 @@
 #!/usr/bin/env python3
 """Convert single fact_perm.parquet to partitioned format by fiscal year."""
 
-import pandas as pd
+import errno
+import os
+import shutil
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+def _move(src: Path, dst: Path) -> None:
+    """Rename src to dst in one syscall; fall back to a copying move across devices."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
+
 def main():
-    # Read the single fact_perm file
+    # Read the single fact_perm file (stays in Arrow; no pandas round-trip)
     print("Reading fact_perm.parquet...")
-    df = pd.read_parquet('artifacts/tables/fact_perm.parquet')
-    print(f"Total rows: {len(df):,}")
-    print(f"Columns: {list(df.columns)}")
+    table = pq.read_table('artifacts/tables/fact_perm.parquet')
+    print(f"Total rows: {table.num_rows:,}")
+    print(f"Columns: {table.column_names}")
 
     # Check if fy column exists
-    if 'fy' not in df.columns:
+    if 'fy' not in table.column_names:
         print("ERROR: 'fy' column not found in dataframe")
         return 1
 
-    print(f"\nFiscal years: {sorted(df['fy'].dropna().unique())}")
+    print(f"\nFiscal years: {sorted(pc.unique(table['fy']).drop_null().to_pylist())}")
     
     # Rename fy to fiscal_year for clarity
-    df = df.rename(columns={'fy': 'fiscal_year'})
+    table = table.rename_columns(
+        ['fiscal_year' if c == 'fy' else c for c in table.column_names]
+    )
     
     # Create partitioned output directory
     output_dir = Path('artifacts/tables/fact_perm_partitioned')
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Write partitioned by fiscal_year
+    # Write partitioned by fiscal_year in one multi-threaded Arrow call;
+    # delete_matching replaces leftovers from an earlier interrupted run.
     print(f"\nWriting partitioned data to {output_dir}/...")
-    df.to_parquet(
-        output_dir,
-        partition_cols=['fiscal_year'],
-        engine='pyarrow',
-        index=False
+    ds.write_dataset(
+        table,
+        base_dir=str(output_dir),
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([table.schema.field('fiscal_year')]), flavor='hive'),
+        basename_template='part-{i}.parquet',
+        existing_data_behavior='delete_matching',
+        use_threads=True,
     )
     
     print("✅ Partitioned PERM data written successfully")
@@ -42,18 +65,17 @@ def main():
     print(f"Partitions: {partitions}")
     
     # Move old file and rename new directory
-    import shutil
     old_file = Path('artifacts/tables/fact_perm.parquet')
     backup_file = Path('artifacts/tables/fact_perm_single_file_backup.parquet')
     
     print(f"\nBacking up old file to {backup_file}")
-    shutil.move(str(old_file), str(backup_file))
+    _move(old_file, backup_file)
     
     print(f"Renaming {output_dir} to artifacts/tables/fact_perm")
     final_dir = Path('artifacts/tables/fact_perm')
     if final_dir.exists():
         shutil.rmtree(final_dir)
-    shutil.move(str(output_dir), str(final_dir))
+    _move(output_dir, final_dir)
     
     print("✅ Migration complete!")
     print(f"   - Old file backed up: {backup_file}")
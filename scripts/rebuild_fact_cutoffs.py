@@ -45,17 +45,17 @@ from src.curate.visa_bulletin_loader import load_visa_bulletin
 
 out = load_visa_bulletin(DATA_ROOT, ARTIFACTS_ROOT, SCHEMAS_PATH)
 
-# Step 3: verify
+# Step 3: verify — one walk of the rebuilt tree; partition dirs are derived
+# from the same file list and row counts come from parquet footers.
 print(f"\n  Done. Output: {out}")
 from pathlib import Path as _P
-import pandas as pd
+import pyarrow.parquet as pq
 
-files = list(_P(out).rglob("*.parquet")) if _P(out).is_dir() else [_P(out)]
-total_rows = 0
-for f in files:
-    df = pd.read_parquet(f)
-    total_rows += len(df)
+files = sorted(_P(out).rglob("*.parquet")) if _P(out).is_dir() else [_P(out)]
+partition_dirs = {f.parent for f in files}
+total_rows = sum(pq.read_metadata(f).num_rows for f in files)
 
 print(f"\n  Partition files: {len(files)}")
+print(f"  Partition dirs:  {len(partition_dirs)}")
 print(f"  Total rows:      {total_rows:,}")
 print("=" * 60)
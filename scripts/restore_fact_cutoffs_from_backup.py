@@ -15,6 +15,7 @@ dry_run: supported via --dry-run flag
 from __future__ import annotations
 
 import argparse
+import os
 import shutil
 import sys
 from datetime import datetime
@@ -36,6 +37,25 @@ def _parquet_row_count(pf: Path) -> int:
         return 0
 
 
+def _clone_file(src: str, dst: str) -> str:
+    """copytree copy_function: copy_file_range lets CoW filesystems (Btrfs, XFS)
+    share extents instead of moving bytes; plain copy2 elsewhere."""
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if n == 0:
+                    break
+                remaining -= n
+        if remaining:
+            raise OSError("short copy_file_range")
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):  # no copy_file_range (non-Linux) or unsupported
+        shutil.copy2(src, dst)
+    return dst
+
+
 def _scan_backup(d: Path) -> tuple[int, int]:
     """Return (n_partitions, total_rows) for a backup timestamp dir."""
     files = sorted(f for f in d.rglob("*.parquet") if not any(x in str(f) for x in EXCLUDE))
@@ -117,13 +137,17 @@ def main() -> None:
     if tmp_dir.exists():
         shutil.rmtree(tmp_dir)
     print(f"\nCopying {n_parts} partition dirs to temp...")
-    shutil.copytree(chosen, tmp_dir)
+    shutil.copytree(chosen, tmp_dir, copy_function=_clone_file)
 
-    # Remove live and rename temp → live
+    # Swap with two directory renames (same parent, O(1) each); the old tree
+    # is deleted only after the restored one is live.
+    prev_dir = LIVE_DIR.parent / f".tmp_{ts_str}_prev"
     if LIVE_DIR.exists():
-        shutil.rmtree(LIVE_DIR)
+        LIVE_DIR.rename(prev_dir)
     tmp_dir.rename(LIVE_DIR)
     print(f"Atomic rename: {tmp_dir.name} → {LIVE_DIR.name}")
+    if prev_dir.exists():
+        shutil.rmtree(prev_dir)
     print(f"\nRestored {n_parts} partitions ({n_rows:,} rows) → {LIVE_DIR}")
 
 
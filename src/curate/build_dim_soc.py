@@ -18,6 +18,20 @@ import pandas as pd
 import yaml
 
 
+# SOC code shapes: canonical XX-XXXX and bare 6 digits (compiled once)
+_SOC_CODE_RE = re.compile(r'^\d{2}-\d{4}$')
+_SOC_DIGITS_RE = re.compile(r'^\d{6}$')
+
+# OEWS all-data columns needed to build dim_soc (matched case-insensitively)
+_OEWS_SOC_COLUMNS = {'OCC_CODE', 'OCC_TITLE', 'O_GROUP'}
+
+# Low-cardinality dim_soc columns written with parquet dictionary encoding
+_DICTIONARY_COLUMNS = [
+    'soc_major_group', 'soc_minor_group', 'soc_broad_group',
+    'soc_version', 'mapping_confidence',
+]
+
+
 def load_soc_layout(layouts_dir: str = "configs/layouts") -> dict:
     """Load SOC layout registry with header aliases and extraction rules."""
     layout_path = Path(layouts_dir) / "soc.yml"
@@ -66,21 +80,37 @@ def normalize_soc_code(code: str, layout: dict) -> Optional[str]:
     code = str(code).strip()
     
     # Check standard format
-    if re.match(r'^\d{2}-\d{4}$', code):
+    if _SOC_CODE_RE.match(code):
         return code
     
     # Check no-hyphen format (6 consecutive digits)
-    if re.match(r'^\d{6}$', code):
+    if _SOC_DIGITS_RE.match(code):
         return f"{code[:2]}-{code[2:]}"
     
     # Try removing extra hyphens/spaces
     cleaned = code.replace(' ', '').replace('-', '')
-    if re.match(r'^\d{6}$', cleaned):
+    if _SOC_DIGITS_RE.match(cleaned):
         return f"{cleaned[:2]}-{cleaned[2:]}"
     
     return None
 
 
+def normalize_soc_codes(codes: pd.Series) -> pd.Series:
+    """
+    Vectorized normalize_soc_code over a Series of raw codes.
+
+    Returns XX-XXXX codes, NaN where the input cannot be normalized.
+    """
+    present = codes.notna()
+    stripped = codes[present].astype(str).str.strip().reindex(codes.index)
+    cleaned = stripped.str.replace(' ', '', regex=False).str.replace('-', '', regex=False)
+
+    hyphenated = (cleaned.str[:2] + '-' + cleaned.str[2:]).where(
+        cleaned.str.match(_SOC_DIGITS_RE, na=False)
+    )
+    return stripped.where(stripped.str.match(_SOC_CODE_RE, na=False), hyphenated)
+
+
 def extract_hierarchy(soc_code: str, layout: dict) -> Dict[str, str]:
     """
     Extract major/minor/broad groups from SOC code using hierarchy rules.
@@ -89,7 +119,7 @@ def extract_hierarchy(soc_code: str, layout: dict) -> Dict[str, str]:
     """
     hierarchy = {}
     
-    if not soc_code or not re.match(r'^\d{2}-\d{4}$', soc_code):
+    if not soc_code or not _SOC_CODE_RE.match(soc_code):
         return {'major_group': None, 'minor_group': None, 'broad_group': None}
     
     # Major group: first 2 digits
@@ -183,7 +213,7 @@ def build_dim_soc(data_root: str, output_path: str, schemas_path: str = "configs
         raise FileNotFoundError(f"OEWS 2023 zip not found: {oews_zip_path}")
 
     print(f"  Reading OEWS 2023: {oews_zip_path}")
-    import zipfile, io
+    import zipfile
     with zipfile.ZipFile(oews_zip_path, 'r') as zf:
         # Find the all-data xlsx inside the zip
         xlsx_names = [n for n in zf.namelist() if n.endswith('.xlsx') and 'all_data_M' in n]
@@ -191,8 +221,24 @@ def build_dim_soc(data_root: str, output_path: str, schemas_path: str = "configs
             raise FileNotFoundError(f"Cannot find all_data_M*.xlsx in {oews_zip_path}")
         xlsx_name = xlsx_names[0]
         print(f"  Reading member: {xlsx_name}")
-        with zf.open(xlsx_name) as xf:
-            oews_df = pd.read_excel(io.BytesIO(xf.read()), dtype=str)
+
+    # The extracted columns never change for a given zip, so reuse the parquet
+    # cache unless the zip is newer than it.
+    cache_path = Path(output_path).parent.parent / "_cache" / "oews_soc_2023.parquet"
+    if cache_path.exists() and cache_path.stat().st_mtime > oews_zip_path.stat().st_mtime:
+        print(f"  Using cached OEWS extract: {cache_path}")
+        oews_df = pd.read_parquet(cache_path)
+    else:
+        # Parse only the columns dim_soc uses; the all-data sheet has ~30 wage columns
+        with zipfile.ZipFile(oews_zip_path, 'r') as zf, zf.open(xlsx_name) as xf:
+            oews_df = pd.read_excel(
+                xf,
+                usecols=lambda c: str(c).upper() in _OEWS_SOC_COLUMNS,
+                dtype=str,
+                engine='openpyxl',
+            )
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        oews_df.to_parquet(cache_path, index=False)
 
     print(f"  OEWS raw rows: {len(oews_df):,}")
 
@@ -218,35 +264,34 @@ def build_dim_soc(data_root: str, output_path: str, schemas_path: str = "configs
     print(f"  Unique OCC_CODEs: {len(unique_oews)}")
 
     # ── Build records from OEWS ───────────────────────────────────────────────
-    records = []
-    for _, row in unique_oews.iterrows():
-        raw_code = row[occ_code_col]
-        soc_code = normalize_soc_code(raw_code, layout)
-        if not soc_code:
-            warnings.append(f"Could not normalize OCC_CODE '{raw_code}' — skipping")
-            continue
-
-        soc_title = str(row[occ_title_col]).strip() if occ_title_col and not pd.isna(row.get(occ_title_col)) else f"SOC {soc_code}"
-        o_group_val = str(row[o_group_col]).strip() if o_group_col and not pd.isna(row.get(o_group_col)) else None
-
-        hierarchy = extract_hierarchy(soc_code, layout)
-
-        records.append({
-            'soc_code':           soc_code,
-            'soc_title':          soc_title,
-            'soc_version':        '2018',
-            'soc_major_group':    hierarchy['major_group'],
-            'soc_minor_group':    hierarchy['minor_group'],
-            'soc_broad_group':    hierarchy['broad_group'],
-            'from_version':       None,
-            'from_code':          None,
-            'mapping_confidence': 'deterministic',
-            'is_aggregated':      False,
-            'source_file':        f'BLS_OEWS/2023/oews_all_data_2023.zip/{xlsx_name}',
-            'ingested_at':        ingested_at,
-        })
-
-    result_df = pd.DataFrame(records)
+    soc_codes = normalize_soc_codes(unique_oews[occ_code_col])
+    valid = soc_codes.notna()
+    for raw_code in unique_oews.loc[~valid, occ_code_col]:
+        warnings.append(f"Could not normalize OCC_CODE '{raw_code}' — skipping")
+
+    soc_codes = soc_codes[valid]
+    if occ_title_col:
+        soc_titles = unique_oews.loc[valid, occ_title_col].str.strip().fillna("SOC " + soc_codes)
+    else:
+        soc_titles = "SOC " + soc_codes
+
+    # Hierarchy by slicing: major XX, minor XX-XX, broad XX-XXX (see extract_hierarchy)
+    records = {
+        'soc_code':           soc_codes,
+        'soc_title':          soc_titles,
+        'soc_version':        '2018',
+        'soc_major_group':    soc_codes.str[:2],
+        'soc_minor_group':    soc_codes.str[:5],
+        'soc_broad_group':    soc_codes.str[:6],
+        'from_version':       None,
+        'from_code':          None,
+        'mapping_confidence': 'deterministic',
+        'is_aggregated':      False,
+        'source_file':        f'BLS_OEWS/2023/oews_all_data_2023.zip/{xlsx_name}',
+        'ingested_at':        ingested_at,
+    }
+
+    result_df = pd.DataFrame(records).reset_index(drop=True)
     print(f"  Built {len(result_df)} records from OEWS")
 
     # ── SUPPLEMENTARY: crosswalk overlay ─────────────────────────────────────
@@ -304,7 +349,17 @@ def build_dim_soc(data_root: str, output_path: str, schemas_path: str = "configs
     # ── Write output ──────────────────────────────────────────────────────────
     out_path = Path(output_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    result_df.to_parquet(out_path, index=False)
+    # Small, highly repetitive dim: zstd + dictionary-encoded group columns,
+    # with column statistics for predicate pushdown by readers.
+    result_df.to_parquet(
+        out_path,
+        index=False,
+        engine='pyarrow',
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=_DICTIONARY_COLUMNS,
+        write_statistics=True,
+    )
 
     print(f"  Written: {out_path}")
     print(f"  Rows: {len(result_df)}")
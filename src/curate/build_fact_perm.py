@@ -2,14 +2,37 @@
 Build fact_perm: PERM labor certification outcomes with dimension joins.
 """
 import hashlib
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import yaml
 from pathlib import Path
 from datetime import datetime, timezone
+from itertools import groupby, islice
+from typing import Iterator
 import re
 import sys
 
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_SOC_DECIMAL_RE = re.compile(r'\.\d+$')
+
+# Columns reported in the post-build validation summary
+_VALIDATION_COLS = [
+    'employer_id', 'soc_code', 'soc_code_raw', 'area_code', 'employer_country',
+    'job_title', 'wage_offer_from', 'worksite_city', 'worksite_state',
+    'received_date', 'naics_code',
+]
+
+# Date columns are never stringified, even when their combined dtype is object
+_DATE_COLS = {'received_date', 'decision_date', 'ingested_at'}
+
+
 def load_employer_layout(layouts_path: Path) -> dict:
     """Load employer normalization rules from layouts/employer.yml."""
     employer_yml = layouts_path / "layouts" / "employer.yml"
@@ -52,6 +75,25 @@ def normalize_employer_name(name: str, layout: dict) -> str:
     return normalized
 
 
+def normalize_employer_names(names: pd.Series, layout: dict) -> pd.Series:
+    """
+    Vectorized normalize_employer_name over a Series.
+    Applies the same ordered steps with .str ops so results match the scalar version.
+    """
+    is_str = names.map(lambda x: isinstance(x, str))
+    normalized = names.where(is_str, "").astype(object).str.lower().str.strip()
+
+    for char in layout.get("punctuation_to_strip", []):
+        normalized = normalized.str.replace(char, " ", regex=False)
+
+    # Suffixes are stripped one after another (order matters, e.g. "x co inc")
+    for suffix in layout.get("suffixes", []):
+        pattern = re.compile(r'\b' + re.escape(suffix.lower()) + r'\.?\s*$', re.IGNORECASE)
+        normalized = normalized.str.replace(pattern, '', regex=True)
+
+    return normalized.str.replace(_WHITESPACE_RE, ' ', regex=True).str.strip()
+
+
 def compute_employer_id(normalized_name: str) -> str:
     """Generate SHA1 hash as employer_id."""
     if not normalized_name:
@@ -60,6 +102,12 @@ def compute_employer_id(normalized_name: str) -> str:
     return hashlib.sha1(normalized_name.encode('utf-8')).hexdigest()
 
 
+def _read_dim(path: Path, columns: list) -> pd.DataFrame:
+    """Read only the lookup columns of a dimension table (those present in its schema)."""
+    available = set(pq.read_schema(path).names)
+    return pd.read_parquet(path, columns=[c for c in columns if c in available])
+
+
 def load_dimensions(artifacts_path: Path) -> dict:
     """Load dimension tables for FK lookups."""
     dims = {}
@@ -67,7 +115,7 @@ def load_dimensions(artifacts_path: Path) -> dict:
     # Load dim_employer
     employer_path = artifacts_path / "tables" / "dim_employer.parquet"
     if employer_path.exists():
-        dims['employer'] = pd.read_parquet(employer_path)
+        dims['employer'] = _read_dim(employer_path, ['employer_id', 'employer_name'])
         print(f"  Loaded dim_employer: {len(dims['employer'])} rows")
     else:
         print(f"  WARNING: dim_employer not found at {employer_path}")
@@ -76,7 +124,7 @@ def load_dimensions(artifacts_path: Path) -> dict:
     # Load dim_soc
     soc_path = artifacts_path / "tables" / "dim_soc.parquet"
     if soc_path.exists():
-        dims['soc'] = pd.read_parquet(soc_path)
+        dims['soc'] = _read_dim(soc_path, ['soc_code'])
         print(f"  Loaded dim_soc: {len(dims['soc'])} rows")
     else:
         print(f"  WARNING: dim_soc not found at {soc_path}")
@@ -85,7 +133,7 @@ def load_dimensions(artifacts_path: Path) -> dict:
     # Load dim_area
     area_path = artifacts_path / "tables" / "dim_area.parquet"
     if area_path.exists():
-        dims['area'] = pd.read_parquet(area_path)
+        dims['area'] = _read_dim(area_path, ['area_code', 'area_title'])
         print(f"  Loaded dim_area: {len(dims['area'])} rows")
     else:
         print(f"  WARNING: dim_area not found at {area_path}")
@@ -94,7 +142,7 @@ def load_dimensions(artifacts_path: Path) -> dict:
     # Load dim_country
     country_path = artifacts_path / "tables" / "dim_country.parquet"
     if country_path.exists():
-        dims['country'] = pd.read_parquet(country_path)
+        dims['country'] = _read_dim(country_path, ['iso3', 'iso2', 'country_name'])
         print(f"  Loaded dim_country: {len(dims['country'])} rows")
     else:
         print(f"  WARNING: dim_country not found at {country_path}")
@@ -125,6 +173,30 @@ def map_soc_code(raw_soc: str, soc_dim: pd.DataFrame) -> str:
     return None
 
 
+def map_soc_codes(raw_soc: pd.Series, soc_index: pd.Index) -> tuple:
+    """
+    Vectorized SOC mapping for a whole column.
+    Returns (soc_code_raw, soc_code): the raw code stripped of its '.XX' suffix,
+    and the canonical code when it (or its hyphenated form) is in soc_index.
+    Non-string inputs map to None in both.
+    """
+    is_str = raw_soc.map(lambda x: isinstance(x, str))
+    # Strip '.xx' decimal suffix (e.g. '17-2112.00' → '17-2112')
+    cleaned = raw_soc.astype(object).where(is_str).str.strip().str.replace(_SOC_DECIMAL_RE, '', regex=True)
+
+    # Try with hyphen normalization (151252 → 15-1252)
+    hyphenated = cleaned.str[:2] + '-' + cleaned.str[2:]
+    can_hyphenate = ~cleaned.str.contains('-', regex=False, na=True) & (cleaned.str.len() >= 6)
+    mapped = cleaned.where(
+        cleaned.isin(soc_index),
+        hyphenated.where(can_hyphenate & hyphenated.isin(soc_index)),
+    )
+
+    soc_code_raw = cleaned.astype(object).where(is_str, None)
+    soc_code = mapped.astype(object).where(mapped.notna(), None)
+    return soc_code_raw, soc_code
+
+
 def map_area_code(raw_area: str, area_dim: pd.DataFrame) -> str:
     """Map raw BLS area code to canonical area_code."""
     if pd.isna(raw_area):
@@ -242,6 +314,83 @@ def find_perm_files(data_root: Path, max_files: int = None, min_fy: int = None)
     return files
 
 
+def _read_excel_to_spool(file_path: Path, spool_path: str) -> str:
+    """Worker: parse one PERM workbook and pickle the frame to spool_path.
+
+    Only the path crosses the process boundary; the parent unpickles it.
+    """
+    pd.read_excel(file_path).to_pickle(spool_path)
+    return spool_path
+
+
+def _prefetch_excel(file_paths: list, max_workers: int) -> Iterator[Future]:
+    """
+    Parse PERM workbooks in worker processes, at most max_workers ahead of
+    the consumer. Yields one Future (resolving to a spool path) per file, in
+    input order; spool files live in a temp dir removed when iteration ends.
+    """
+    with tempfile.TemporaryDirectory(prefix='.tmp_perm_spool_') as spool_dir, \
+            ProcessPoolExecutor(max_workers=max_workers) as executor:
+        numbered = enumerate(file_paths)
+
+        def _submit(item):
+            idx, path = item
+            spool = os.path.join(spool_dir, f"{idx}_{Path(path).stem}.pkl")
+            return executor.submit(_read_excel_to_spool, path, spool)
+
+        pending = deque(_submit(item) for item in islice(numbered, max_workers))
+        while pending:
+            fut = pending.popleft()
+            nxt = next(numbered, None)
+            if nxt is not None:
+                pending.append(_submit(nxt))
+            yield fut
+
+
+def _cast_for_write(fy_df: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    """
+    Apply the parquet-compatibility casts for the given combined dtypes.
+
+    ``dtypes`` are the dtypes all FYs would have after one pd.concat. Columns
+    that combine to object (mixed types) are converted to string value by
+    value, as astype(str) on the concatenated frame would; other columns are
+    brought to the combined dtype (e.g. int64 wages in one FY, float64 in
+    another), so every partition gets the same type and formatting.
+    """
+    cast = {}
+    for col in fy_df.columns:
+        target = dtypes[col]
+        if pd.api.types.is_object_dtype(target) and col not in _DATE_COLS:
+            cast[col] = fy_df[col].astype(object).astype(str)
+        elif fy_df[col].dtype != target:
+            cast[col] = fy_df[col].astype(target)
+    return fy_df.assign(**cast) if cast else fy_df
+
+
+def _write_fy_partition(fy_df: pd.DataFrame, output_path: Path, fy: int,
+                        dtypes: pd.Series) -> Path:
+    """
+    Write one fiscal_year partition to output_path/fiscal_year=FY/part-0.parquet.
+    Only this FY's directory is touched, so partial rebuilds leave others intact.
+    """
+    fy_df = _cast_for_write(fy_df, dtypes)
+
+    # pyarrow writes the hive directory and drops fiscal_year from the file;
+    # delete_matching clears stale files in this FY's directory only.
+    table = pa.Table.from_pandas(fy_df, preserve_index=False)
+    ds.write_dataset(
+        table,
+        base_dir=str(output_path),
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([table.schema.field('fiscal_year')]), flavor='hive'),
+        basename_template='part-{i}.parquet',
+        existing_data_behavior='delete_matching',
+    )
+    fy_parquet = output_path / f"fiscal_year={fy}" / "part-0.parquet"
+    print(f"    Written FY{fy}: {len(fy_df):,} rows → {fy_parquet}")
+    return fy_parquet
+
+
 def build_fact_perm(
     data_root: Path,
     output_path: Path,
@@ -250,6 +399,7 @@ def build_fact_perm(
     chunk_size: int = 100000,
     dry_run: bool = False,
     min_fy: int = None,
+    read_workers: int = None,
 ):
     """
     Build fact_perm from PERM Excel files with chunked processing.
@@ -263,6 +413,9 @@ def build_fact_perm(
         chunk_size: Maximum rows to process per chunk (default 100k)
         dry_run: If True, discover files only without writing outputs
         min_fy: If set, only process FY >= min_fy (for targeted partial rebuilds)
+        read_workers: Worker processes parsing Excel files ahead of the FY loop
+            (default: min(4, os.cpu_count())); bounds how many parsed files
+            are held at once
     """
     print("[BUILD FACT_PERM" + (" - DRY RUN]" if dry_run else "]"))
     
@@ -303,35 +456,23 @@ def build_fact_perm(
     dims = load_dimensions(artifacts_path)
     
     # Pre-build lookup sets for fast vectorized mapping
-    soc_valid = set(dims['soc']['soc_code'].values)
+    soc_index = pd.Index(dims['soc']['soc_code'].dropna().unique())
     area_df = dims['area']
     area_valid = set(area_df['area_code'].values)
     # Build area_title → area_code map for name-format BLS area values
     area_title_map: dict[str, str] = {}
     if 'area_title' in area_df.columns:
-        for _, arow in area_df.dropna(subset=['area_title', 'area_code']).iterrows():
-            title_key = str(arow['area_title']).strip().upper()
-            area_title_map[title_key] = str(arow['area_code'])
+        titled = area_df.dropna(subset=['area_title', 'area_code'])
+        area_title_map = dict(zip(
+            titled['area_title'].astype(str).str.strip().str.upper(),
+            titled['area_code'].astype(str),
+        ))
     country_upper_map = dict(zip(
         dims['country']['country_name'].str.upper().fillna(''),
         dims['country']['iso3']
     ))
     country_iso3_set = set(dims['country']['iso3'].values)
 
-    def _map_soc_vec(raw_soc):
-        if pd.isna(raw_soc) or not isinstance(raw_soc, str):
-            return None
-        s = str(raw_soc).strip()
-        # Strip '.xx' decimal suffix (e.g. '17-2112.00' → '17-2112')
-        s = re.sub(r'\.\d+$', '', s)
-        if s in soc_valid:
-            return s
-        if '-' not in s and len(s) >= 6:
-            norm = f"{s[:2]}-{s[2:]}"
-            if norm in soc_valid:
-                return norm
-        return None
-
     def _map_area_vec(raw_area):
         if pd.isna(raw_area):
             return None
@@ -362,224 +503,273 @@ def build_fact_perm(
             return 'USA'
         return None
 
-    # Process each file
-    all_dfs = []
+    # Process one fiscal year at a time: perm_files is sorted by FY, so each
+    # FY's files are contiguous. Each partition is built, validated and written
+    # before the next FY is read, keeping peak memory at the largest single FY
+    # instead of the full multi-year dataset.
     total_processed = 0
+    total_rows = 0
+    unique_case_numbers = set()
+    non_null_counts = {col: 0 for col in _VALIDATION_COLS}
+    fy_dist = {}
+    written_fys = []
+    fy_frames = {}  # FY -> zero-row frame carrying its pre-cast dtypes
     unmapped_soc = set()
     unmapped_area = set()
     unmapped_country = set()
-    
-    for fy, file_path in perm_files:
-        print(f"\n  Processing FY{fy}...")
+
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    # openpyxl parsing is CPU-bound and dominates the build; parse upcoming
+    # workbooks in worker processes while the current FY is mapped and written.
+    workers = read_workers or min(4, os.cpu_count() or 1)
+    excel_futures = _prefetch_excel([fp for _, fp in perm_files], workers)
+
+    for fy, fy_files in groupby(perm_files, key=lambda x: x[0]):
+        fy_dfs = []
+        for _, file_path in fy_files:
+            print(f"\n  Processing FY{fy}...")
         
-        try:
-            # Read full Excel file
-            df = pd.read_excel(file_path)
-            print(f"    Loaded {len(df)} rows, {len(df.columns)} cols")
-
-            # ── Column name normalisation ──────────────────────────────────
-            # PERM files use 4+ naming eras:
-            #   Legacy SPACES  (FY2009):  "DECISION DATE", "EMPLOYER NAME"
-            #   Legacy Title   (FY2013-14): "Decision_Date", "Employer_Name"
-            #   iCERT UPPER    (FY2015-19): "CASE_RECEIVED_DATE"
-            #   FLAG UPPER     (FY2020-24): "RECEIVED_DATE"
-            # Normalise ALL column names to UPPER_UNDERSCORE so col_map
-            # can use a single canonical lookup regardless of era.
-            df.columns = df.columns.str.strip().str.upper().str.replace(' ', '_')
-
-            # Multi-schema column candidates: try each in order, use first match.
-            # After normalisation all column names are UPPER_UNDERSCORE.
-            # Aliases are ordered: newer-form → older-form (first match wins).
-            col_map = {
-                'case_number':      ['CASE_NUMBER', 'CASE_NO'],
-                'case_status':      ['CASE_STATUS'],
-                'received_date':    ['RECEIVED_DATE', 'CASE_RECEIVED_DATE'],
-                'decision_date':    ['DECISION_DATE'],
-                'employer_name':    ['EMP_BUSINESS_NAME', 'EMPLOYER_NAME'],
-                'employer_country': [
-                    # Worker's country of citizenship (most useful for immigration analytics).
-                    # FY2008-2024 old form: COUNTRY_OF_CITIZENSHIP / COUNTRY_OF_CITZENSHIP (typo in source).
-                    # FY2024 new form / FY2025+: only EMP_COUNTRY available (employer location).
-                    'COUNTRY_OF_CITIZENSHIP', 'COUNTRY_OF_CITZENSHIP',
-                    'EMP_COUNTRY', 'EMPLOYER_COUNTRY',
-                ],
-                'soc_code':         ['PWD_SOC_CODE', 'PW_SOC_CODE'],
-                'soc_title':        ['PWD_SOC_TITLE', 'PW_SOC_TITLE'],
-                'job_title':        [
-                    'JOB_TITLE',              # FY2020+ FLAG / new form
-                    'JOB_INFO_JOB_TITLE',     # FY2015-2019 iCERT (actual job title)
-                    'PW_JOB_TITLE_9089',      # FY2008-2018 legacy
-                    'PW_JOB_TITLE',           # FY2019
-                ],
-                'wage_from':        [
-                    'JOB_OPP_WAGE_FROM',      # FY2024 new / FY2025+
-                    'WAGE_OFFER_FROM',        # FY2020-2024 FLAG
-                    'WAGE_OFFER_FROM_9089',   # FY2008-2018
-                    'WAGE_OFFERED_FROM_9089',  # FY2013-2014, FY2019
-                ],
-                'wage_to':          [
-                    'JOB_OPP_WAGE_TO',
-                    'WAGE_OFFER_TO',
-                    'WAGE_OFFER_TO_9089',
-                    'WAGE_OFFERED_TO_9089',
-                ],
-                'wage_unit':        [
-                    'JOB_OPP_WAGE_PER',
-                    'WAGE_OFFER_UNIT_OF_PAY',
-                    'PW_UNIT_OF_PAY_9089',
-                    'WAGE_OFFER_UNIT_OF_PAY_9089',
-                    'WAGE_OFFERED_UNIT_OF_PAY_9089',
-                ],
-                'worksite_city':    [
-                    'PRIMARY_WORKSITE_CITY',   # FY2024 new / FY2025+
-                    'WORKSITE_CITY',           # FY2020-2024 FLAG
-                    'JOB_INFO_WORK_CITY',      # FY2008-2019 iCERT (actual worksite)
-                    'EMPLOYER_CITY',           # FY2008-2019 fallback (employer HQ)
-                ],
-                'worksite_state':   [
-                    'PRIMARY_WORKSITE_STATE',
-                    'WORKSITE_STATE',
-                    'JOB_INFO_WORK_STATE',
-                    'EMPLOYER_STATE',
-                    'EMPLOYER_STATE_PROVINCE',
-                ],
-                'worksite_postal':  [
-                    'PRIMARY_WORKSITE_POSTAL_CODE',
-                    'WORKSITE_POSTAL_CODE',
-                    'JOB_INFO_WORK_POSTAL_CODE',
-                    'EMPLOYER_POSTAL_CODE',
-                ],
-                'worksite_area':    ['PRIMARY_WORKSITE_BLS_AREA'],  # FY2024 new+ only
-                'is_fulltime':      ['OTHER_REQ_IS_FULLTIME_EMP'],
-                'naics_code':       [
-                    'NAICS_CODE',             # FY2020-2024 FLAG
-                    'NAICS_US_CODE',          # FY2015-2019 iCERT
-                    'EMP_NAICS',              # FY2024 new / FY2025+
-                    '2007_NAICS_US_CODE',     # FY2008-2014 legacy
-                ],
-            }
-
-            # Check which logical fields have no matching column
-            missing = [k for k, cands in col_map.items()
-                       if not any(c in df.columns for c in cands)]
-            if missing:
-                print(f"    WARNING: Missing columns: {missing}")
-
-            # Helper: try each candidate in order; return first that exists
-            def safe_col(key):
-                candidates = col_map.get(key, [])
-                for cname in candidates:
-                    if cname in df.columns:
-                        return df[cname]
-                return pd.Series([None] * len(df), index=df.index, dtype=object)
-
-            # --- Vectorized employer normalisation + hashing ---
-            employer_series = safe_col('employer_name').apply(
-                lambda x: normalize_employer_name(x, layout)
-            )
-            employer_id_series = employer_series.apply(compute_employer_id)
-
-            # --- Vectorized SOC mapping ---
-            raw_soc_series = safe_col('soc_code')
-            # Preserve the raw SOC code (stripped of .XX suffix) for downstream
-            # consumers that need the original code even when dim_soc lookup fails.
-            soc_code_raw_series = raw_soc_series.apply(
-                lambda x: re.sub(r'\.\d+$', '', str(x).strip()) if pd.notna(x) and isinstance(x, str) else None
-            )
-            soc_code_series = raw_soc_series.apply(_map_soc_vec)
-            unmapped_soc.update(
-                raw_soc_series[
-                    raw_soc_series.notna() & soc_code_series.isna()
-                ].astype(str).unique()
-            )
-
-            # --- Vectorized area mapping ---
-            raw_area_series = safe_col('worksite_area')
-            area_code_series = raw_area_series.apply(_map_area_vec)
-            unmapped_area.update(
-                raw_area_series[
-                    raw_area_series.notna() & area_code_series.isna()
-                ].astype(str).unique()
-            )
-
-            # --- Vectorized country mapping ---
-            raw_country_series = safe_col('employer_country')
-            country_series = raw_country_series.apply(_map_country_vec)
-            unmapped_country.update(
-                raw_country_series[
-                    raw_country_series.notna() & country_series.isna()
-                ].astype(str).unique()
-            )
-
-            # --- Dates ---
-            received_date_series = pd.to_datetime(safe_col('received_date'), errors='coerce')
-            decision_date_series = pd.to_datetime(safe_col('decision_date'), errors='coerce')
-
-            # --- Build chunk DataFrame ---
-            chunk_df = pd.DataFrame({
-                'case_number':    safe_col('case_number'),
-                'case_status':    safe_col('case_status').astype(str).str.strip().str.upper(),
-                'received_date':  received_date_series,
-                'decision_date':  decision_date_series,
-                'employer_id':    employer_id_series,
-                'employer_name':  safe_col('employer_name').astype(str).str.strip(),
-                'soc_code':       soc_code_series,
-                'soc_code_raw':   soc_code_raw_series,
-                'area_code':      area_code_series,
-                'employer_country': country_series,
-                'job_title':      safe_col('job_title'),
-                'wage_offer_from': pd.to_numeric(safe_col('wage_from'), errors='coerce'),
-                'wage_offer_to':  pd.to_numeric(safe_col('wage_to'), errors='coerce'),
-                'wage_offer_unit': safe_col('wage_unit'),
-                'worksite_city':  safe_col('worksite_city'),
-                'worksite_state': safe_col('worksite_state'),
-                'worksite_postal': safe_col('worksite_postal').astype(str),
-                'is_fulltime':    safe_col('is_fulltime').astype(str).str.strip().str.upper() == 'Y',
-                'naics_code':     safe_col('naics_code'),
-                # *** Key fix: force fiscal_year from directory, not from received_date ***
-                'fiscal_year':    fy,
-                'source_file':    f"PERM/PERM/FY{fy}/{file_path.name}",
-                'ingested_at':    datetime.now(timezone.utc),
-            })
-
-            all_dfs.append(chunk_df)
-            total_processed += len(df)
-            print(f"    Processed {len(df)} rows from FY{fy} (fiscal_year forced={fy})")
+            try:
+                # Read full Excel file (parsed ahead by a worker process)
+                spool_path = next(excel_futures).result()
+                df = pd.read_pickle(spool_path)
+                os.remove(spool_path)
+                print(f"    Loaded {len(df)} rows, {len(df.columns)} cols")
+
+                # ── Column name normalisation ──────────────────────────────────
+                # PERM files use 4+ naming eras:
+                #   Legacy SPACES  (FY2009):  "DECISION DATE", "EMPLOYER NAME"
+                #   Legacy Title   (FY2013-14): "Decision_Date", "Employer_Name"
+                #   iCERT UPPER    (FY2015-19): "CASE_RECEIVED_DATE"
+                #   FLAG UPPER     (FY2020-24): "RECEIVED_DATE"
+                # Normalise ALL column names to UPPER_UNDERSCORE so col_map
+                # can use a single canonical lookup regardless of era.
+                df.columns = df.columns.str.strip().str.upper().str.replace(' ', '_')
+
+                # Multi-schema column candidates: try each in order, use first match.
+                # After normalisation all column names are UPPER_UNDERSCORE.
+                # Aliases are ordered: newer-form → older-form (first match wins).
+                col_map = {
+                    'case_number':      ['CASE_NUMBER', 'CASE_NO'],
+                    'case_status':      ['CASE_STATUS'],
+                    'received_date':    ['RECEIVED_DATE', 'CASE_RECEIVED_DATE'],
+                    'decision_date':    ['DECISION_DATE'],
+                    'employer_name':    ['EMP_BUSINESS_NAME', 'EMPLOYER_NAME'],
+                    'employer_country': [
+                        # Worker's country of citizenship (most useful for immigration analytics).
+                        # FY2008-2024 old form: COUNTRY_OF_CITIZENSHIP / COUNTRY_OF_CITZENSHIP (typo in source).
+                        # FY2024 new form / FY2025+: only EMP_COUNTRY available (employer location).
+                        'COUNTRY_OF_CITIZENSHIP', 'COUNTRY_OF_CITZENSHIP',
+                        'EMP_COUNTRY', 'EMPLOYER_COUNTRY',
+                    ],
+                    'soc_code':         ['PWD_SOC_CODE', 'PW_SOC_CODE'],
+                    'soc_title':        ['PWD_SOC_TITLE', 'PW_SOC_TITLE'],
+                    'job_title':        [
+                        'JOB_TITLE',              # FY2020+ FLAG / new form
+                        'JOB_INFO_JOB_TITLE',     # FY2015-2019 iCERT (actual job title)
+                        'PW_JOB_TITLE_9089',      # FY2008-2018 legacy
+                        'PW_JOB_TITLE',           # FY2019
+                    ],
+                    'wage_from':        [
+                        'JOB_OPP_WAGE_FROM',      # FY2024 new / FY2025+
+                        'WAGE_OFFER_FROM',        # FY2020-2024 FLAG
+                        'WAGE_OFFER_FROM_9089',   # FY2008-2018
+                        'WAGE_OFFERED_FROM_9089',  # FY2013-2014, FY2019
+                    ],
+                    'wage_to':          [
+                        'JOB_OPP_WAGE_TO',
+                        'WAGE_OFFER_TO',
+                        'WAGE_OFFER_TO_9089',
+                        'WAGE_OFFERED_TO_9089',
+                    ],
+                    'wage_unit':        [
+                        'JOB_OPP_WAGE_PER',
+                        'WAGE_OFFER_UNIT_OF_PAY',
+                        'PW_UNIT_OF_PAY_9089',
+                        'WAGE_OFFER_UNIT_OF_PAY_9089',
+                        'WAGE_OFFERED_UNIT_OF_PAY_9089',
+                    ],
+                    'worksite_city':    [
+                        'PRIMARY_WORKSITE_CITY',   # FY2024 new / FY2025+
+                        'WORKSITE_CITY',           # FY2020-2024 FLAG
+                        'JOB_INFO_WORK_CITY',      # FY2008-2019 iCERT (actual worksite)
+                        'EMPLOYER_CITY',           # FY2008-2019 fallback (employer HQ)
+                    ],
+                    'worksite_state':   [
+                        'PRIMARY_WORKSITE_STATE',
+                        'WORKSITE_STATE',
+                        'JOB_INFO_WORK_STATE',
+                        'EMPLOYER_STATE',
+                        'EMPLOYER_STATE_PROVINCE',
+                    ],
+                    'worksite_postal':  [
+                        'PRIMARY_WORKSITE_POSTAL_CODE',
+                        'WORKSITE_POSTAL_CODE',
+                        'JOB_INFO_WORK_POSTAL_CODE',
+                        'EMPLOYER_POSTAL_CODE',
+                    ],
+                    'worksite_area':    ['PRIMARY_WORKSITE_BLS_AREA'],  # FY2024 new+ only
+                    'is_fulltime':      ['OTHER_REQ_IS_FULLTIME_EMP'],
+                    'naics_code':       [
+                        'NAICS_CODE',             # FY2020-2024 FLAG
+                        'NAICS_US_CODE',          # FY2015-2019 iCERT
+                        'EMP_NAICS',              # FY2024 new / FY2025+
+                        '2007_NAICS_US_CODE',     # FY2008-2014 legacy
+                    ],
+                }
+
+                # Check which logical fields have no matching column
+                missing = [k for k, cands in col_map.items()
+                           if not any(c in df.columns for c in cands)]
+                if missing:
+                    print(f"    WARNING: Missing columns: {missing}")
+
+                # Helper: try each candidate in order; return first that exists
+                def safe_col(key):
+                    candidates = col_map.get(key, [])
+                    for cname in candidates:
+                        if cname in df.columns:
+                            return df[cname]
+                    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+                # --- Vectorized employer normalisation + hashing ---
+                employer_series = normalize_employer_names(safe_col('employer_name'), layout)
+                # Hash each distinct name once; names repeat heavily across cases
+                unique_names = employer_series.unique()
+                name_to_id = dict(zip(unique_names, [compute_employer_id(n) for n in unique_names]))
+                employer_id_series = employer_series.map(name_to_id)
+
+                # --- Vectorized SOC mapping ---
+                raw_soc_series = safe_col('soc_code')
+                # Preserve the raw SOC code (stripped of .XX suffix) for downstream
+                # consumers that need the original code even when dim_soc lookup fails.
+                soc_code_raw_series, soc_code_series = map_soc_codes(raw_soc_series, soc_index)
+                unmapped_soc.update(
+                    raw_soc_series[
+                        raw_soc_series.notna() & soc_code_series.isna()
+                    ].astype(str).unique()
+                )
+
+                # --- Vectorized area mapping ---
+                raw_area_series = safe_col('worksite_area')
+                area_code_series = raw_area_series.apply(_map_area_vec)
+                unmapped_area.update(
+                    raw_area_series[
+                        raw_area_series.notna() & area_code_series.isna()
+                    ].astype(str).unique()
+                )
+
+                # --- Vectorized country mapping ---
+                raw_country_series = safe_col('employer_country')
+                country_series = raw_country_series.apply(_map_country_vec)
+                unmapped_country.update(
+                    raw_country_series[
+                        raw_country_series.notna() & country_series.isna()
+                    ].astype(str).unique()
+                )
+
+                # --- Dates ---
+                received_date_series = pd.to_datetime(safe_col('received_date'), errors='coerce')
+                decision_date_series = pd.to_datetime(safe_col('decision_date'), errors='coerce')
+
+                # --- Build chunk DataFrame ---
+                chunk_df = pd.DataFrame({
+                    'case_number':    safe_col('case_number'),
+                    'case_status':    safe_col('case_status').astype(str).str.strip().str.upper(),
+                    'received_date':  received_date_series,
+                    'decision_date':  decision_date_series,
+                    'employer_id':    employer_id_series,
+                    'employer_name':  safe_col('employer_name').astype(str).str.strip(),
+                    'soc_code':       soc_code_series,
+                    'soc_code_raw':   soc_code_raw_series,
+                    'area_code':      area_code_series,
+                    'employer_country': country_series,
+                    'job_title':      safe_col('job_title'),
+                    'wage_offer_from': pd.to_numeric(safe_col('wage_from'), errors='coerce'),
+                    'wage_offer_to':  pd.to_numeric(safe_col('wage_to'), errors='coerce'),
+                    'wage_offer_unit': safe_col('wage_unit'),
+                    'worksite_city':  safe_col('worksite_city'),
+                    'worksite_state': safe_col('worksite_state'),
+                    'worksite_postal': safe_col('worksite_postal').astype(str),
+                    'is_fulltime':    safe_col('is_fulltime').astype(str).str.strip().str.upper() == 'Y',
+                    'naics_code':     safe_col('naics_code'),
+                    # *** Key fix: force fiscal_year from directory, not from received_date ***
+                    'fiscal_year':    fy,
+                    'source_file':    f"PERM/PERM/FY{fy}/{file_path.name}",
+                    'ingested_at':    datetime.now(timezone.utc),
+                })
+
+                fy_dfs.append(chunk_df)
+                total_processed += len(df)
+                print(f"    Processed {len(df)} rows from FY{fy} (fiscal_year forced={fy})")
             
-        except Exception as e:
-            print(f"    ERROR processing {file_path.name}: {e}")
+            except Exception as e:
+                print(f"    ERROR processing {file_path.name}: {e}")
+                continue
+
+        if not fy_dfs:
             continue
-    
-    # Build final DataFrame
-    if not all_dfs:
+
+        fy_df = pd.concat(fy_dfs, ignore_index=True) if len(fy_dfs) > 1 else fy_dfs[0]
+        del fy_dfs
+
+        # Accumulate validation counters before the string conversion below
+        total_rows += len(fy_df)
+        unique_case_numbers.update(fy_df['case_number'].dropna().unique())
+        for col in _VALIDATION_COLS:
+            non_null_counts[col] += int(fy_df[col].notna().sum())
+        fy_dist[fy] = len(fy_df)
+
+        # Written with this FY's own dtypes; re-cast below if other FYs widen them
+        fy_frames[fy] = fy_df.iloc[:0]
+        _write_fy_partition(fy_df, output_path, fy, fy_df.dtypes)
+        written_fys.append(fy)
+        del fy_df
+
+    excel_futures.close()  # shut down the read pool and remove the spool dir
+
+    if not written_fys:
         print("  No rows to write")
         return
-    
-    result_df = pd.concat(all_dfs, ignore_index=True)
-    
+
+    # Dtypes the FYs combine to (what one concat of every FY would give). A
+    # partition whose own dtypes differ is read back and rewritten with the
+    # combined ones; columns stringified at first write already combine to object.
+    combined = pd.concat(list(fy_frames.values())).dtypes
+    for fy, frame in fy_frames.items():
+        if frame.dtypes.equals(combined):
+            continue
+        fy_df = pd.read_parquet(output_path / f"fiscal_year={fy}")
+        fy_df.insert(frame.columns.get_loc('fiscal_year'), 'fiscal_year', fy)
+        print(f"  Re-casting FY{fy} to the combined schema")
+        _write_fy_partition(fy_df[frame.columns], output_path, fy, combined)
+
+    def _pct(col):
+        return non_null_counts[col] / total_rows * 100 if total_rows else 0.0
+
     print(f"\n  Processed {total_processed} total rows")
-    print(f"  Built {len(result_df)} fact_perm records")
-    
+    print(f"  Built {total_rows} fact_perm records")
+
     # Validation
     print(f"\n  Validation:")
-    print(f"    Unique case_numbers: {result_df['case_number'].nunique()}")
-    print(f"    Non-null employer_id: {result_df['employer_id'].notna().sum()}")
-    print(f"    Non-null soc_code: {result_df['soc_code'].notna().sum()} ({result_df['soc_code'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null soc_code_raw: {result_df['soc_code_raw'].notna().sum()} ({result_df['soc_code_raw'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null area_code: {result_df['area_code'].notna().sum()}")
-    print(f"    Non-null employer_country: {result_df['employer_country'].notna().sum()} ({result_df['employer_country'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null job_title: {result_df['job_title'].notna().sum()} ({result_df['job_title'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null wage_offer_from: {result_df['wage_offer_from'].notna().sum()} ({result_df['wage_offer_from'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null worksite_city: {result_df['worksite_city'].notna().sum()} ({result_df['worksite_city'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null worksite_state: {result_df['worksite_state'].notna().sum()} ({result_df['worksite_state'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null received_date: {result_df['received_date'].notna().sum()} ({result_df['received_date'].notna().mean()*100:.1f}%)")
-    print(f"    Non-null naics_code: {result_df['naics_code'].notna().sum()} ({result_df['naics_code'].notna().mean()*100:.1f}%)")
-
-    fy_dist = result_df['fiscal_year'].value_counts().sort_index()
+    print(f"    Unique case_numbers: {len(unique_case_numbers)}")
+    print(f"    Non-null employer_id: {non_null_counts['employer_id']}")
+    print(f"    Non-null soc_code: {non_null_counts['soc_code']} ({_pct('soc_code'):.1f}%)")
+    print(f"    Non-null soc_code_raw: {non_null_counts['soc_code_raw']} ({_pct('soc_code_raw'):.1f}%)")
+    print(f"    Non-null area_code: {non_null_counts['area_code']}")
+    print(f"    Non-null employer_country: {non_null_counts['employer_country']} ({_pct('employer_country'):.1f}%)")
+    print(f"    Non-null job_title: {non_null_counts['job_title']} ({_pct('job_title'):.1f}%)")
+    print(f"    Non-null wage_offer_from: {non_null_counts['wage_offer_from']} ({_pct('wage_offer_from'):.1f}%)")
+    print(f"    Non-null worksite_city: {non_null_counts['worksite_city']} ({_pct('worksite_city'):.1f}%)")
+    print(f"    Non-null worksite_state: {non_null_counts['worksite_state']} ({_pct('worksite_state'):.1f}%)")
+    print(f"    Non-null received_date: {non_null_counts['received_date']} ({_pct('received_date'):.1f}%)")
+    print(f"    Non-null naics_code: {non_null_counts['naics_code']} ({_pct('naics_code'):.1f}%)")
+
     print(f"\n  fiscal_year distribution ({len(fy_dist)} partitions):")
-    for fyr, cnt in fy_dist.items():
-        print(f"    FY{fyr}: {cnt:,}")
-    zero_rows = (result_df['fiscal_year'] == 0).sum()
+    for fyr in sorted(fy_dist):
+        print(f"    FY{fyr}: {fy_dist[fyr]:,}")
+    zero_rows = fy_dist.get(0, 0)
     if zero_rows:
         print(f"  WARNING: {zero_rows} rows still have fiscal_year=0 (unexpected after directory fix)")
     else:
@@ -592,31 +782,9 @@ def build_fact_perm(
     if unmapped_country:
         print(f"    Unmapped countries: {len(unmapped_country)} (samples: {list(unmapped_country)[:5]})")
 
-    # Convert object columns to string to handle mixed types
-    print("\n  Converting object columns to string type for parquet compatibility...")
-    object_cols = result_df.select_dtypes(include=['object']).columns.tolist()
-    # Keep date columns as-is
-    skip_cols = {'received_date', 'decision_date', 'ingested_at'}
-    for col in object_cols:
-        if col not in skip_cols:
-            result_df[col] = result_df[col].astype(str)
-
-    # Write Hive-partitioned parquet: write each FY partition separately
-    # so we ONLY overwrite the FY partitions present in result_df (safe for partial rebuilds)
-    output_path.mkdir(parents=True, exist_ok=True)
-    written_fys = []
-    for fy_val, fy_df in result_df.groupby('fiscal_year'):
-        fy_dir = output_path / f"fiscal_year={fy_val}"
-        fy_dir.mkdir(parents=True, exist_ok=True)
-        fy_parquet = fy_dir / "part-0.parquet"
-        fy_df_write = fy_df.drop(columns=['fiscal_year'])
-        fy_df_write.to_parquet(fy_parquet, index=False, engine='pyarrow')
-        written_fys.append(fy_val)
-    print(f"  Written (partitioned): {output_path}/fiscal_year=YYYY/part-0.parquet")
+    print(f"\n  Written (partitioned): {output_path}/fiscal_year=YYYY/part-0.parquet")
     print(f"  Partitions written: {sorted(written_fys)}")
-    print(f"  Total rows: {len(result_df):,}")
-    
-    return result_df
+    print(f"  Total rows: {total_rows:,}")
 
 
 if __name__ == "__main__":
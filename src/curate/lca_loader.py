@@ -466,7 +466,10 @@ def _process_one_file(
         norm = norm.str.replace(r"\s+", " ", regex=True).str.strip()
         min_len = emp_layout.get("min_len", 3)
         norm = norm.where(norm.str.len() >= min_len, "")
-        result["employer_id"] = norm.apply(lambda x: hashlib.sha1(x.encode("utf-8")).hexdigest() if x else "")
+        # Hash each distinct name once (SHA1 kept: employer_id is a shared FK)
+        unique_names = norm.unique()
+        name_to_id = {n: hashlib.sha1(n.encode("utf-8")).hexdigest() if n else "" for n in unique_names}
+        result["employer_id"] = norm.map(name_to_id)
     else:
         result["employer_name_raw"] = ""
         result["employer_id"] = ""
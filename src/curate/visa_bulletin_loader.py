@@ -1,11 +1,16 @@
 """Visa Bulletin loader - parses PDFs into structured time series."""
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from itertools import repeat
+import os
 from pathlib import Path
 import re
 from typing import List, Optional, Tuple
 import pandas as pd
 import pdfplumber
+import pyarrow as pa
+import pyarrow.dataset as ds
 
 
 # Month name to number mapping (both full and abbreviated forms)
@@ -48,6 +53,27 @@ COUNTRY_COLUMNS_7 = [
     'INDIA', 'MEXICO', 'PHILIPPINES', 'VIETNAM',
 ]
 
+# Page filter and chart headings, matched case-insensitively on the raw page
+# text (lookahead so overlapping headings, e.g. "CUT-OFF DATES FOR FILING",
+# all match)
+_EMPLOYMENT_RE = re.compile(r'EMPLOYMENT', re.IGNORECASE)
+_CHART_MARKER_RE = re.compile(
+    r'(?=(FINAL ACTION DATES|CUT-OFF DATE|DATES FOR FILING))', re.IGNORECASE
+)
+
+# Real bulletins are tens of KB or more; anything smaller is a truncated
+# download or saved error page and is skipped before pdfminer is invoked
+_MIN_PDF_BYTES = 8 * 1024
+
+# Low-cardinality fact_cutoffs columns written dictionary-encoded
+_DICTIONARY_COLUMNS = ['chart', 'category', 'country', 'status_flag']
+
+# Hive partition keys for fact_cutoffs (month kept zero-padded in paths)
+_CUTOFF_PARTITION_SCHEMA = pa.schema([
+    ('bulletin_year', pa.int64()),
+    ('bulletin_month', pa.string()),
+])
+
 # Category normalization
 CATEGORY_MAP = {
     '1st': 'EB1',
@@ -233,7 +259,126 @@ def extract_employment_table_from_text(text: str, chart_type: str) -> List[List]
     return table_rows if len(table_rows) > 1 else []
 
 
-def load_visa_bulletin(data_root: str, out_dir: str, schemas_path: str = None) -> str:
+def _parse_bulletin_pdf(pdf_file: Path, data_root: Path) -> Tuple[str, str, List[dict]]:
+    """
+    Parse one Visa Bulletin PDF into fact_cutoffs rows.
+
+    Runs in a worker process. Returns (status, detail, rows) where status is
+    'ok', 'skip' (no parsable date, undersized file or no pages) or 'error'.
+    """
+    try:
+        # Extract year and month from filename
+        year, month = parse_filename(pdf_file.name)
+        if not year or not month:
+            return 'skip', "couldn't parse date", []
+
+        # Cheap stat/page-tree checks before any text extraction
+        size = pdf_file.stat().st_size
+        if size < _MIN_PDF_BYTES:
+            return 'skip', f"file too small ({size} bytes)", []
+
+        # Get relative path from data_root for source_file tracking
+        try:
+            rel_path = pdf_file.relative_to(data_root)
+        except ValueError:
+            # If not relative to data_root, use absolute path
+            rel_path = pdf_file
+
+        rows_out = []
+        # Open PDF and extract text
+        with pdfplumber.open(pdf_file) as pdf:
+            if not pdf.pages:
+                return 'skip', "no pages", []
+            fad_found = False   # Track if FAD already found for this file
+            dff_found = False   # Track if DFF already found for this file
+            for page_num, page in enumerate(pdf.pages):
+                text = page.extract_text()
+                if not text:
+                    continue
+
+                # Both charts are employment-based tables; skip other pages
+                if not _EMPLOYMENT_RE.search(text):
+                    continue
+                markers = {m.upper() for m in _CHART_MARKER_RE.findall(text)}
+
+                # Check for Final Action Dates chart (case-insensitive)
+                # Newer format (2015+): "FINAL ACTION DATES FOR EMPLOYMENT-BASED"
+                # Older format (2011-2014): "CUT-OFF DATE LISTED BELOW" + "EMPLOYMENT"
+                is_fad_page = bool(markers & {'FINAL ACTION DATES', 'CUT-OFF DATE'})
+                if is_fad_page and not fad_found:
+                    table = extract_employment_table_from_text(text, 'FAD')
+                    if table:
+                        rows = parse_employment_table(
+                            table, year, month, 'FAD',
+                            str(rel_path), f"page_{page_num+1}"
+                        )
+                        rows_out.extend(rows)
+                        fad_found = True
+
+                # Check for Dates for Filing chart (case-insensitive)
+                if 'DATES FOR FILING' in markers and not dff_found:
+                    table = extract_employment_table_from_text(text, 'DFF')
+                    if table:
+                        rows = parse_employment_table(
+                            table, year, month, 'DFF',
+                            str(rel_path), f"page_{page_num+1}"
+                        )
+                        rows_out.extend(rows)
+                        dff_found = True
+
+                # Both charts captured: later pages cannot add rows
+                if fad_found and dff_found:
+                    break
+
+        return 'ok', f"{year}-{month:02d}", rows_out
+
+    except Exception as e:
+        return 'error', str(e), []
+
+
+def _write_cutoff_partitions(df: pd.DataFrame, out_path: Path) -> int:
+    """
+    Write df as bulletin_year=YYYY/bulletin_month=MM/data.parquet with one
+    pyarrow write_dataset call. Returns the number of partitions written.
+    """
+    # Dedup within partition: keep last occurrence per (chart, category, country)
+    df = df.drop_duplicates(
+        subset=['bulletin_year', 'bulletin_month', 'chart', 'category', 'country'], keep='last'
+    )
+    # Month as a zero-padded string so directories stay bulletin_month=05
+    df = df.assign(bulletin_month=df['bulletin_month'].map('{:02d}'.format))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # zstd + dictionary-encoded key columns, with column statistics so readers
+    # can skip on chart/category/country predicates
+    parquet_format = ds.ParquetFileFormat()
+    file_options = parquet_format.make_write_options(
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=[c for c in _DICTIONARY_COLUMNS if c in table.column_names],
+        write_statistics=True,
+    )
+
+    written: List[str] = []
+    ds.write_dataset(
+        table,
+        base_dir=str(out_path),
+        format=parquet_format,
+        file_options=file_options,
+        partitioning=ds.partitioning(_CUTOFF_PARTITION_SCHEMA, flavor='hive'),
+        basename_template='data-{i}.parquet',
+        existing_data_behavior='delete_matching',
+        file_visitor=lambda f: written.append(f.path),
+    )
+    # Keep the established single data.parquet file name per partition
+    for path in written:
+        os.replace(path, Path(path).with_name('data.parquet'))
+    return len(written)
+
+
+def load_visa_bulletin(
+    data_root: str, out_dir: str, schemas_path: str = None, max_workers: Optional[int] = None
+) -> str:
     """
     Load and parse Visa Bulletin PDFs into fact_cutoffs table.
     
@@ -241,6 +386,7 @@ def load_visa_bulletin(data_root: str, out_dir: str, schemas_path: str = None) -
         data_root: Root path to Project 1 downloads
         out_dir: Output directory for parquet files
         schemas_path: Path to schemas.yml (optional)
+        max_workers: Worker processes for PDF parsing (default: os.cpu_count())
     
     Returns:
         Path to output directory
@@ -265,72 +411,28 @@ def load_visa_bulletin(data_root: str, out_dir: str, schemas_path: str = None) -
     files_processed = 0
     files_failed = 0
     
-    # Process ALL PDFs (sorted by year/month)
-    print(f"  Processing ALL {len(pdf_files)} PDFs...")
-    for idx, pdf_file in enumerate(sorted(pdf_files, reverse=True), 1):
-        try:
-            # Extract year and month from filename
-            year, month = parse_filename(pdf_file.name)
-            if not year or not month:
-                print(f"  [{idx}/{len(pdf_files)}] SKIP {pdf_file.name}: couldn't parse date")
+    # Process ALL PDFs (sorted by year/month). Text extraction is CPU-bound in
+    # pdfminer, so PDFs are parsed in worker processes; results come back in
+    # input order, keeping the row order the partition dedup relies on.
+    ordered_pdfs = sorted(pdf_files, reverse=True)
+    workers = max_workers or os.cpu_count() or 1
+    print(f"  Processing ALL {len(pdf_files)} PDFs ({workers} workers)...")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _parse_bulletin_pdf, ordered_pdfs, repeat(Path(data_root)), chunksize=4
+        )
+        for idx, (pdf_file, (status, detail, rows)) in enumerate(zip(ordered_pdfs, results), 1):
+            if status == 'skip':
+                print(f"  [{idx}/{len(pdf_files)}] SKIP {pdf_file.name}: {detail}")
                 files_failed += 1
-                continue
-            
-            if idx % 20 == 0 or idx == 1:
-                print(f"  [{idx}/{len(pdf_files)}] Processing: {pdf_file.name} ({year}-{month:02d})")
-            
-            # Get relative path from data_root for source_file tracking
-            try:
-                rel_path = pdf_file.relative_to(Path(data_root))
-            except ValueError:
-                # If not relative to data_root, use absolute path
-                rel_path = pdf_file
-            
-            # Open PDF and extract text
-            with pdfplumber.open(pdf_file) as pdf:
-                fad_found = False   # Track if FAD already found for this file
-                dff_found = False   # Track if DFF already found for this file
-                for page_num, page in enumerate(pdf.pages):
-                    text = page.extract_text()
-                    if not text:
-                        continue
-                    
-                    text_upper = text.upper()
-                    
-                    # Check for Final Action Dates chart (case-insensitive)
-                    # Newer format (2015+): "FINAL ACTION DATES FOR EMPLOYMENT-BASED"
-                    # Older format (2011-2014): "CUT-OFF DATE LISTED BELOW" + "EMPLOYMENT"
-                    is_fad_page = (
-                        ('FINAL ACTION DATES' in text_upper and 'EMPLOYMENT' in text_upper)
-                        or ('CUT-OFF DATE' in text_upper and 'EMPLOYMENT' in text_upper)
-                    )
-                    if is_fad_page and not fad_found:
-                        table = extract_employment_table_from_text(text, 'FAD')
-                        if table:
-                            rows = parse_employment_table(
-                                table, year, month, 'FAD',
-                                str(rel_path), f"page_{page_num+1}"
-                            )
-                            all_rows.extend(rows)
-                            fad_found = True
-                    
-                    # Check for Dates for Filing chart (case-insensitive)
-                    if 'DATES FOR FILING' in text_upper and 'EMPLOYMENT' in text_upper and not dff_found:
-                        table = extract_employment_table_from_text(text, 'DFF')
-                        if table:
-                            rows = parse_employment_table(
-                                table, year, month, 'DFF',
-                                str(rel_path), f"page_{page_num+1}"
-                            )
-                            all_rows.extend(rows)
-                            dff_found = True
-            
-            files_processed += 1
-            
-        except Exception as e:
-            print(f"  [{idx}/{len(pdf_files)}] ERROR {pdf_file.name}: {e}")
-            files_failed += 1
-            continue
+            elif status == 'error':
+                print(f"  [{idx}/{len(pdf_files)}] ERROR {pdf_file.name}: {detail}")
+                files_failed += 1
+            else:
+                if idx % 20 == 0 or idx == 1:
+                    print(f"  [{idx}/{len(pdf_files)}] Processed: {pdf_file.name} ({detail})")
+                all_rows.extend(rows)
+                files_processed += 1
     
     print(f"  ✅ Processed {files_processed} files successfully")
     print(f"  ⚠️  Failed/skipped {files_failed} files")
@@ -352,21 +454,10 @@ def load_visa_bulletin(data_root: str, out_dir: str, schemas_path: str = None) -
         out_path = Path(out_dir) / "tables" / "fact_cutoffs"
         out_path.mkdir(parents=True, exist_ok=True)
         
-        # Write as partitioned by bulletin_year/bulletin_month
-        for (year, month), group in df.groupby(['bulletin_year', 'bulletin_month']):
-            # Drop partition columns from data (they'll be in directory structure)
-            group_data = group.drop(columns=['bulletin_year', 'bulletin_month'])
-            # Dedup within partition: keep last occurrence per (chart, category, country)
-            group_data = group_data.drop_duplicates(
-                subset=['chart', 'category', 'country'], keep='last'
-            )
-            partition_dir = out_path / f"bulletin_year={year}" / f"bulletin_month={month:02d}"
-            partition_dir.mkdir(parents=True, exist_ok=True)
-            partition_file = partition_dir / "data.parquet"
-            group_data.to_parquet(partition_file, index=False, engine='pyarrow')
+        n_partitions = _write_cutoff_partitions(df, out_path)
         
         print(f"  Written: {out_path}")
-        print(f"  Partitions: {len(df.groupby(['bulletin_year', 'bulletin_month']))}")
+        print(f"  Partitions: {n_partitions}")
         
         return str(out_path)
     else:
@@ -1000,11 +1000,18 @@ def _build_lca_perm_chunks(chunks: list) -> None:
         # PERM approval/denial rates by FY
         if "fiscal_year" in perm.columns and "case_status" in perm.columns:
             lines = ["PERM Approval/Denial Rates by Fiscal Year:"]
-            for fy in sorted(perm["fiscal_year"].dropna().unique()):
-                fy_data = perm[perm["fiscal_year"] == fy]
-                total = len(fy_data)
-                certified = (fy_data["case_status"].str.upper() == "CERTIFIED").sum()
-                denied = (fy_data["case_status"].str.upper() == "DENIED").sum()
+            # One grouped pass instead of re-scanning perm once per FY
+            status = perm["case_status"].str.upper()
+            by_fy = pd.DataFrame({
+                "fiscal_year": perm["fiscal_year"],
+                "certified": status == "CERTIFIED",
+                "denied": status == "DENIED",
+            }).groupby("fiscal_year", dropna=True, observed=True).agg(
+                total=("certified", "size"),
+                certified=("certified", "sum"),
+                denied=("denied", "sum"),
+            )
+            for fy, total, certified, denied in by_fy.itertuples():
                 rate = certified / total * 100 if total > 0 else 0
                 lines.append(f"  FY{fy}: {total:,} total, {certified:,} certified "
                              f"({rate:.1f}%), {denied:,} denied")
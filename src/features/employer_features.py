@@ -134,7 +134,6 @@ def build_employer_features(in_tables: Path, out_path: Path) -> None:
     perm = perm.dropna(subset=['decision_date', 'employer_id'])
 
     anchor = perm['decision_date'].max()
-    anchor_month = anchor.to_period('M')
     log(f'  Anchor date: {anchor.date()} (max decision_date)')
 
     start_36m = anchor - pd.DateOffset(months=36)
@@ -143,9 +142,14 @@ def build_employer_features(in_tables: Path, out_path: Path) -> None:
 
     # Decision month for window bucketing
     perm_36['dec_month'] = perm_36['decision_date'].dt.to_period('M')
-    months_back = (anchor_month - perm_36['dec_month']).apply(lambda x: x.n)
-    perm_36['in_12m'] = months_back < 12
-    perm_36['in_24m'] = months_back < 24
+    # Whole months before the anchor month, from integer year/month arithmetic
+    # (no per-row Period offset objects)
+    dd = perm_36['decision_date']
+    perm_36['months_back'] = (
+        (anchor.year - dd.dt.year) * 12 + (anchor.month - dd.dt.month)
+    ).astype('int64')
+    perm_36['in_12m'] = perm_36['months_back'] < 12
+    perm_36['in_24m'] = perm_36['months_back'] < 24
     # 36m = all rows already
 
     # Normalise SOC codes to 7-char (XX-XXXX) for OEWS matching
@@ -346,7 +350,7 @@ def build_employer_features(in_tables: Path, out_path: Path) -> None:
 
         g24 = grp[grp['in_24m']]
         g12 = grp[grp['in_12m']]
-        months_back = (anchor_month - grp['dec_month']).apply(lambda x: x.n)
+        months_back = grp['months_back']
         g_prior_12 = grp[(months_back >= 12) & (months_back < 24)]
 
         # Rates
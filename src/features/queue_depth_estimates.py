@@ -103,9 +103,11 @@ def _load_latest_cutoffs(tables_dir: Path) -> pd.DataFrame:
         raise FileNotFoundError(f"fact_cutoffs_all not found at {cutoffs_path}")
 
     fc = pd.read_parquet(cutoffs_path)
-    fc["bulletin_date"] = pd.to_datetime(
-        fc["bulletin_year"].astype(str) + "-" + fc["bulletin_month"].astype(str) + "-01",
-        errors="coerce",
+    # Integer bulletin ordinal (year*12 + month) — avoids building and parsing
+    # a date string per row just to find the latest bulletin.
+    fc["bulletin_ord"] = (
+        pd.to_numeric(fc["bulletin_year"], errors="coerce") * 12
+        + pd.to_numeric(fc["bulletin_month"], errors="coerce")
     )
 
     # Keep only EB1/EB2/EB3 + DFF chart + date-based (not Current/Unavailable)
@@ -116,12 +118,10 @@ def _load_latest_cutoffs(tables_dir: Path) -> pd.DataFrame:
     ].copy()
     fc["cutoff_date"] = pd.to_datetime(fc["cutoff_date"], errors="coerce")
 
-    # Latest bulletin per category × country
-    latest = (
-        fc.sort_values("bulletin_date", ascending=False)
-        .drop_duplicates(["category", "country"])
-        .set_index(["category", "country"])["cutoff_date"]
-    )
+    # Latest bulletin per category × country (O(N) group reduce, no full sort)
+    fc = fc.dropna(subset=["bulletin_ord"])
+    idx = fc.groupby(["category", "country"], sort=False)["bulletin_ord"].idxmax()
+    latest = fc.loc[idx].set_index(["category", "country"])["cutoff_date"]
     return latest
 
 
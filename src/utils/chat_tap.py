@@ -35,6 +35,7 @@ one-shot initialisation.
 """
 from __future__ import annotations
 
+import atexit
 import contextlib
 import json
 import os
@@ -76,6 +77,7 @@ _SESSION_ID: str = ""
 _BUFFER: deque[dict] = deque(maxlen=2_000)
 _CURRENT_TASK: str = "idle"
 _LOCK = threading.Lock()
+_HANDLES: dict[Path, Any] = {}   # open append handles for LIVE_LOG / LIVE_NDJSON
 
 # ── Directory bootstrap ───────────────────────────────────────────────────────
 def _makedirs() -> None:
@@ -84,6 +86,35 @@ def _makedirs() -> None:
 
 
 # ── Core writer ───────────────────────────────────────────────────────────────
+def _append_line(path: Path, line: str) -> None:
+    """
+    Append one line via a handle kept open for the life of the process.
+    Line-buffered, so every entry is flushed as it is written.  Reopens if
+    the file was removed underneath us (e.g. a logs cleanup).  Caller holds _LOCK.
+    """
+    fh = _HANDLES.get(path)
+    if fh is not None and os.fstat(fh.fileno()).st_nlink == 0:
+        fh.close()
+        fh = None
+    if fh is None:
+        fh = path.open("a", encoding="utf-8", buffering=1)
+        _HANDLES[path] = fh
+    fh.write(line + "\n")
+
+
+def _close_handles() -> None:
+    with _LOCK:
+        for fh in _HANDLES.values():
+            try:
+                fh.close()
+            except Exception:
+                pass
+        _HANDLES.clear()
+
+
+atexit.register(_close_handles)
+
+
 def _write(entry: dict) -> None:
     """Append to log, ndjson, and in-memory buffer (thread-safe)."""
     line_log = (
@@ -96,15 +127,13 @@ def _write(entry: dict) -> None:
     with _LOCK:
         # Human-readable log
         try:
-            with LIVE_LOG.open("a", encoding="utf-8") as fh:
-                fh.write(line_log + "\n")
+            _append_line(LIVE_LOG, line_log)
         except Exception:
             pass
 
         # Structured NDJSON
         try:
-            with LIVE_NDJSON.open("a", encoding="utf-8") as fh:
-                fh.write(line_ndjson + "\n")
+            _append_line(LIVE_NDJSON, line_ndjson)
         except Exception:
             pass
 
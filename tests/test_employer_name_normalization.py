@@ -216,3 +216,31 @@ def test_normalize_module_google_dedup():
     ]
     results = {normalize_employer_name(v) for v in variants}
     assert len(results) == 1, f"Expected 1 key, got {len(results)}: {results}"
+
+
+# ---------------------------------------------------------------------------
+# build_fact_perm: vectorized normalizer matches the scalar pipeline
+# ---------------------------------------------------------------------------
+
+def test_fact_perm_vectorized_normalizer_matches_scalar():
+    """normalize_employer_names must give the same keys as normalize_employer_name."""
+    from src.curate.build_fact_perm import (
+        load_employer_layout,
+        normalize_employer_name,
+        normalize_employer_names,
+    )
+    layout = load_employer_layout(Path("configs"))
+    raw = pd.Series([
+        "Google Inc.",
+        "GOOGLE LLC,",
+        "Acme Co Inc",
+        "  Smith & Sons (USA), L.L.C. ",
+        "Foo-Bar Corp.",
+        "Tata Consultancy Services Limited",
+        "",
+        None,
+        float("nan"),
+        12345,
+    ], dtype=object)
+    expected = [normalize_employer_name(x, layout) for x in raw]
+    assert normalize_employer_names(raw, layout).tolist() == expected